@@ -27,7 +27,7 @@ from datetime import datetime
 # Import from src/ package
 from src.config import load_yaml, compute_job_hash
 from src.extensions import process_addons, load_and_apply_operations
-from src.variant import build_variant_structure, write_variant_yaml, load_variant_yaml
+from src.variant import build_variant_structure, write_variant_yaml, load_variant_yaml, COMPOSITION_FILE, COMPOSITION_INDEX_FILE
 
 
 def main():
@@ -253,11 +253,12 @@ def build_variant(job_dir, job_conf, global_conf, args, root_dir, job_defaults,
     print(f"   📂 Stacked count: {structure['stacked_count']}")
     print(f"   🔗 Hash: {structure['job_config_hash'][:16]}...")
     
-    # Show composition file count
-    comp_dir = output_dir / 'composition'
-    if comp_dir.exists():
-        comp_files = list(comp_dir.glob('c*.yaml'))
-        print(f"   📁 {len(comp_files)} composition batch files")
+    # Show composition batch count (one line per document in the index)
+    comp_idx = output_dir / COMPOSITION_INDEX_FILE
+    if comp_idx.exists():
+        with open(comp_idx, 'r') as f:
+            batch_count = sum(1 for line in f if line.strip())
+        print(f"   📁 {COMPOSITION_FILE}: {batch_count} composition batches")
 
 
 def update_outputs_index(job_dir: Path, job_name: str, structure: dict):
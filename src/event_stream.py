@@ -91,12 +91,9 @@ class EventStream:
                 'job_name': self.run_meta.get('job_id', ''),
             })
 
+            # Also writes the final manifest (executor shares our output_path)
             self.executor.execute()
 
-            # Final manifest write
-            if self.executor.block_artifacts and self.output_path:
-                self.executor.write_manifest(self.output_path)
-
             stats = self.executor.stats()
             self.pipeline.execute_hook('job_end', {
                 'job_name': self.run_meta.get('job_id', ''),
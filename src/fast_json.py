@@ -0,0 +1,93 @@
+"""
+fast_json.py - JSON encode/decode with optional orjson acceleration
+
+orjson is an optional dependency (not in requirements.txt). When it is
+installed, dumps()/loads() use its C encoder/decoder; otherwise they fall back
+to the stdlib json module. Both backends return bytes from dumps() so callers
+can write files in binary mode without caring which one is active.
+
+Values orjson refuses (integers wider than 64 bits, non-string dict keys) are
+retried through stdlib json, so switching backends never turns previously
+valid output into an error. Strings stdlib json can only emit escaped (lone
+surrogates) are written ASCII-escaped. When a default is given, datetimes,
+dataclasses and subclasses of builtin types are not formatted by orjson
+itself, so the bytes written match the stdlib backend. Likewise loads() retries input orjson rejects but
+stdlib json accepts (NaN/Infinity literals).
+
+Usage:
+    from src.fast_json import dumps, loads
+
+    path.write_bytes(dumps(manifest, pretty=True))
+    data = loads(path.read_bytes())
+"""
+
+import json
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any, pretty: bool = False, sort_keys: bool = False,
+          default: Optional[Callable] = None) -> bytes:
+    """
+    Serialize obj to UTF-8 JSON bytes.
+
+    Args:
+        obj: Value to serialize
+        pretty: Indent with 2 spaces (otherwise compact, no whitespace)
+        sort_keys: Sort dict keys for deterministic output
+        default: Called for objects neither backend can serialize natively
+    """
+    if orjson is not None:
+        option = 0
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        orjson_default = default
+        if default is not None:
+            option |= (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS |
+                       orjson.OPT_PASSTHROUGH_SUBCLASS)
+            orjson_default = _passthrough_default(default)
+        try:
+            return orjson.dumps(obj, default=orjson_default, option=option)
+        except TypeError:
+            pass  # Fall through to stdlib for values orjson rejects
+
+    try:
+        return _stdlib_dumps(obj, pretty, sort_keys, default, ensure_ascii=False).encode('utf-8')
+    except UnicodeEncodeError:
+        # Lone surrogates have no UTF-8 form; json escapes them as \udXXX
+        return _stdlib_dumps(obj, pretty, sort_keys, default, ensure_ascii=True).encode('ascii')
+
+
+def _stdlib_dumps(obj, pretty, sort_keys, default, ensure_ascii):
+    if pretty:
+        return json.dumps(obj, indent=2, sort_keys=sort_keys, default=default,
+                          ensure_ascii=ensure_ascii)
+    return json.dumps(obj, separators=(',', ':'), sort_keys=sort_keys,
+                      default=default, ensure_ascii=ensure_ascii)
+
+
+def _passthrough_default(default):
+    """Wrap default so passed-through builtin subclasses go to stdlib json."""
+    def wrapped(obj):
+        if isinstance(obj, (str, int, float, dict, list, tuple)):
+            # stdlib encodes these natively (OrderedDict as an object,
+            # namedtuple as an array) - raising hands the value to it
+            raise TypeError(type(obj).__name__)
+        return default(obj)
+    return wrapped
+
+
+def loads(data) -> Any:
+    """Parse JSON from bytes or str. Raises ValueError on invalid JSON."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # Fall through to stdlib for input orjson rejects
+    return json.loads(data)
@@ -88,7 +88,7 @@ from pathlib import Path
 
 from src.config import resolve_path
 from src.extensions import is_dynamic_text_key, resolve_extension
-from src.wildcards import resolve_wildcards, process_text_variant, apply_text_consumption_mode
+from src.wildcards import resolve_wildcards, iter_text_variant, apply_text_consumption_mode
 from src.loras import parse_lora_combination_string, build_suffix_string, generate_job_permutations
 from src.exceptions import ExtensionError, WildcardError
 
@@ -602,6 +602,7 @@ def build_jobs(task_conf, lora_root, range_increment, prompts_delimiter, global_
         # =====================================================================
 
         # Pre-expand structured text variants
+        wildcard_lookup = None
         if current_wildcards and text_components:
             wildcard_lookup = {wc.get('name'): wc.get('text', []) for wc in current_wildcards if wc.get('name')}
             
@@ -610,7 +611,7 @@ def build_jobs(task_conf, lora_root, range_increment, prompts_delimiter, global_
                 for item in text_components[key]:
                     try:
                         prompt_wildcards_max = p_entry_copy.get('wildcards_max', p_entry_copy.get('ext_wildcards_max', wildcards_max))
-                        expanded_list.extend(process_text_variant(item, wildcard_lookup, default_mode=prompt_wildcards_max))
+                        expanded_list.extend(iter_text_variant(item, wildcard_lookup, default_mode=prompt_wildcards_max))
                     except WildcardError as e:
                         print(f"   ❌ FATAL ERROR: Wildcard expansion failure for prompt '{p_entry_copy.get('id', 'unknown')}'.")
                         sys.exit(f"   Error: {e}")
@@ -627,7 +628,8 @@ def build_jobs(task_conf, lora_root, range_increment, prompts_delimiter, global_
             for key in keys_to_substitute:
                 text_list = text_components[key]
                 try:
-                    resolved_texts, usage_list = resolve_wildcards(text_list, current_wildcards, track_usage=True)
+                    resolved_texts, usage_list = resolve_wildcards(text_list, current_wildcards, track_usage=True,
+                                                                   wildcard_lookup=wildcard_lookup)
                     text_components[key] = resolved_texts
                     # Store usage mapping: resolved_text -> wc_usage dict
                     for resolved_text, usage_dict in zip(resolved_texts, usage_list):
@@ -50,17 +50,53 @@ HOOK CONTEXT (Strategy D — namespace separation):
   values) is never overridden by block annotations. Hooks receive both independently.
   See docs/composition-model.md "Theme Metadata (meta)".
 
-  `upstream_artifacts` is a read-only copy of artifacts from completed blocks.
+  `upstream_artifacts` is a read-only view of artifacts from completed blocks.
   Each artifact dict may include `disk_path` (relative path to JSONL or binary file)
   and `disk_line` (line offset in JSONL, text artifacts only) when flushed to disk.
   Text artifacts are consolidated into JSONL files to prevent file explosion at scale.
   Hooks can attach arbitrary keys to artifact dicts — the engine never strips them.
 """
 
+import itertools
+import time
+from collections import namedtuple
+from collections.abc import Sequence
+from types import MappingProxyType
 from typing import List, Dict, Optional, Callable, Any
 
+from src.fast_json import dumps as json_dumps
 from src.hooks import HookPipeline, HookResult, STATUS_SUCCESS, STATUS_ERROR
 
+# Per-composition hook stages, in execution order
+_COMPOSITION_STAGES = ('pre', 'generate', 'post')
+
+# Minimum seconds between mid-run manifest rewrites (final write always happens)
+_MANIFEST_DEBOUNCE_S = 2.0
+
+# One queue slot: a single composition of a single block
+QueueEntry = namedtuple('QueueEntry', 'block_path composition_idx parent_key parent_block_path')
+
+
+class _ArtifactsView(Sequence):
+    """Read-only, zero-copy view over one block's live artifact list."""
+
+    __slots__ = ('_items',)
+
+    def __init__(self, items: list):
+        self._items = items
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __repr__(self):
+        return f'_ArtifactsView({self._items!r})'
+
 
 class TreeExecutor:
     """
@@ -99,9 +135,15 @@ class TreeExecutor:
         # Build block tree from flat jobs list
         self.blocks = self._build_block_tree(jobs)
 
+        # Adjacency indexes (built once — blocks never change after init)
+        self._children_of = {}            # parent_path -> [child block, ...] sorted by path
+        self._dependents_of = {}          # block_path -> [blocks whose depends_on lists it]
+        self._build_adjacency()
+
         # Execution state
         self.queue = []             # Flat depth-first queue of entries
         self.queue_position = 0     # Current cursor position (preserved across stop/resume)
+        self._skip_to = []          # queue position -> first position past its block's run
         self._state = self.IDLE     # Overall execution state
 
         # Block-level tracking
@@ -114,9 +156,19 @@ class TreeExecutor:
 
         # Composition-level tracking
         self.variation_results = {}       # "block_path:idx" -> HookResult (for parent->child passing)
+        self._children_remaining = {}     # parent_key -> child compositions yet to consume it
         self.completed_compositions = 0   # Global counter
         self.stop_requested = False       # Stop flag
         self.block_artifacts = {}         # block_path -> [artifact_dict, ...]
+        self._manifest_last_write = 0.0   # time.monotonic() of last manifest write
+        self._manifest_dirty = False      # Flushed artifacts not yet in manifest.json
+        self._manifest_pretty = False     # Last manifest write was the indented one
+        self._ensured_dirs = set()        # Directories already created this run
+
+        # Read-only views handed to hooks, rebuilt only after the source changes
+        self._snapshots = {}              # attribute name -> MappingProxyType
+        self._artifacts_view = {}         # block_path -> _ArtifactsView over block_artifacts
+        self._artifacts_view_ro = MappingProxyType(self._artifacts_view)
 
     def _build_block_tree(self, jobs: list) -> dict:
         """Group flat job list by _block_path into block definitions."""
@@ -127,62 +179,61 @@ class TreeExecutor:
             if path is None:
                 # Jobs from old format (no nested text) won't have _block_path
                 path = '0'
-            if path not in blocks:
-                # Extract depends_on from:
-                # 1. Prompt-level depends_on (multi-prompt pipelines)
-                # 2. Annotation _depends_on (single-prompt, per-block dependency)
-                depends_on = prompt.get('depends_on', [])
-                annotations = prompt.get('_annotations', {}) or {}
-                ann_depends = annotations.get('_depends_on', [])
-                if isinstance(depends_on, str):
-                    depends_on = [depends_on]
-                if isinstance(ann_depends, str):
-                    ann_depends = [ann_depends]
-                # Merge both sources (annotation takes precedence for per-block config)
-                all_deps = list(depends_on) + [d for d in ann_depends if d not in depends_on]
-                blocks[path] = {
-                    'path': path,
-                    'parent_path': prompt.get('_parent_path'),
-                    'depends_on': all_deps,
-                    'compositions': 0,
-                    'jobs': [],
-                }
-            blocks[path]['compositions'] += 1
-            blocks[path]['jobs'].append(job)
+            block = blocks.get(path)
+            if block is None:
+                block = blocks[path] = self._new_block(path, prompt)
+            block['compositions'] += 1
+            block['jobs'].append(job)
         return blocks
 
+    @staticmethod
+    def _new_block(path: str, prompt: dict) -> dict:
+        """Block definition for the first job seen at path."""
+        # Extract depends_on from:
+        # 1. Prompt-level depends_on (multi-prompt pipelines)
+        # 2. Annotation _depends_on (single-prompt, per-block dependency)
+        depends_on = prompt.get('depends_on', [])
+        annotations = prompt.get('_annotations', {}) or {}
+        ann_depends = annotations.get('_depends_on', [])
+        if isinstance(depends_on, str):
+            depends_on = [depends_on]
+        if isinstance(ann_depends, str):
+            ann_depends = [ann_depends]
+        # Merge both sources (annotation takes precedence for per-block config)
+        all_deps = list(depends_on) + [d for d in ann_depends if d not in depends_on]
+        return {
+            'path': path,
+            'path_tuple': tuple(path.split('.')),
+            'parent_path': prompt.get('_parent_path'),
+            'depends_on': all_deps,
+            '_depends_on_set': frozenset(all_deps),
+            'compositions': 0,
+            'jobs': [],
+        }
+
+    def _build_adjacency(self):
+        """Index parent->children and dependency->dependents so lookups skip full scans."""
+        for block in self.blocks.values():
+            self._children_of.setdefault(block['parent_path'], []).append(block)
+            for dep in dict.fromkeys(block.get('depends_on', [])):
+                self._dependents_of.setdefault(dep, []).append(block)
+        for children in self._children_of.values():
+            children.sort(key=lambda c: c['path'])
+
     def build_queue(self) -> list:
         """
         Build flat execution queue in dependency-respecting depth-first order.
 
-        Each entry: { block_path, composition_idx, parent_key }
+        Each entry: QueueEntry(block_path, composition_idx, parent_key, parent_block_path)
         parent_key: "block_path:composition_idx" or None for roots
+        parent_block_path: block_path half of parent_key, or None for roots
 
         Roots are topologically sorted so that blocks with depends_on are
         placed after their dependency targets. Within a dependency tier,
         the original lexicographic order is preserved.
         """
         queue = []
-
-        def enqueue_subtree(block_path, idx, parent_key):
-            queue.append({
-                'block_path': block_path,
-                'composition_idx': idx,
-                'parent_key': parent_key,
-            })
-            children = [b for b in self.blocks.values()
-                        if b['parent_path'] == block_path]
-            for child in sorted(children, key=lambda c: c['path']):
-                parent_block = self.blocks[block_path]
-                if parent_block['compositions'] > 0:
-                    child_comps_per_parent = child['compositions'] // parent_block['compositions']
-                else:
-                    child_comps_per_parent = 0
-                start_idx = idx * child_comps_per_parent
-                for c in range(child_comps_per_parent):
-                    child_idx = start_idx + c
-                    if child_idx < child['compositions']:
-                        enqueue_subtree(child['path'], child_idx, f"{block_path}:{idx}")
+        self._children_remaining = {}
 
         # Roots: blocks with no parent, or whose parent doesn't exist in blocks.
         # The latter happens when build_text_variations() merges parent text into
@@ -194,13 +245,74 @@ class TreeExecutor:
         # Blocks with depends_on targets are placed after those targets.
         roots = self._topo_sort_roots(roots)
 
-        for root in roots:
-            for i in range(root['compositions']):
-                enqueue_subtree(root['path'], i, None)
+        # Explicit LIFO stack of QueueEntry. Pushed in reverse so pops come out
+        # in depth-first, lexicographic order.
+        stack = [QueueEntry(root['path'], i, None, None)
+                 for root in reversed(roots)
+                 for i in reversed(range(root['compositions']))]
+
+        while stack:
+            entry = stack.pop()
+            queue.append(entry)
+            block_path, idx = entry.block_path, entry.composition_idx
+            children = self._children_of.get(block_path)
+            parent_comps = self.blocks[block_path]['compositions']
+            if not children or parent_comps <= 0:
+                continue
+            parent_key = f"{block_path}:{idx}"
+            pending = []
+            for child in children:
+                child_comps_per_parent = child['compositions'] // parent_comps
+                start_idx = idx * child_comps_per_parent
+                end_idx = min(start_idx + child_comps_per_parent, child['compositions'])
+                child_path = child['path']
+                for child_idx in range(start_idx, end_idx):
+                    pending.append(QueueEntry(child_path, child_idx, parent_key, block_path))
+            self._children_remaining[parent_key] = len(pending)
+            stack.extend(reversed(pending))
 
         self.queue = queue
+        self._skip_to = self._build_skip_index(queue)
         return queue
 
+    def _build_skip_index(self, queue: list) -> list:
+        """
+        For each queue position, the first position past its block's run.
+
+        A run is the consecutive sibling entries of one block under one parent
+        composition, plus their subtrees (contiguous in depth-first order). Once a
+        block is failed or blocked, every descendant is blocked too, so execute()
+        can jump over the whole run instead of skipping entry by entry.
+        """
+        n = len(queue)
+        depth = {}
+        for block in self.blocks.values():
+            d, parent = 0, block['parent_path']
+            while parent in self.blocks:
+                d += 1
+                parent = self.blocks[parent]['parent_path']
+            depth[block['path']] = d
+
+        # Subtree end: first later position at the same or shallower depth
+        subtree_end = [n] * n
+        open_entries = []
+        for j, entry in enumerate(queue):
+            d = depth[entry.block_path]
+            while open_entries and depth[queue[open_entries[-1]].block_path] >= d:
+                subtree_end[open_entries.pop()] = j
+            open_entries.append(j)
+
+        # Extend across following siblings of the same block and parent
+        skip_to = [n] * n
+        for i in range(n - 1, -1, -1):
+            end = subtree_end[i]
+            if end < n:
+                entry, nxt = queue[i], queue[end]
+                if nxt.block_path == entry.block_path and nxt.parent_key == entry.parent_key:
+                    end = skip_to[end]
+            skip_to[i] = end
+        return skip_to
+
     def _topo_sort_roots(self, roots: list) -> list:
         """
         Topological sort of root blocks respecting depends_on.
@@ -211,29 +323,29 @@ class TreeExecutor:
 
         Within the same dependency tier, lexicographic order is preserved.
         """
-        # Build set of all block paths under each root subtree
-        root_paths = {r['path'] for r in roots}
+        # Paths are compared as tuples of segments ("0.1" -> ("0", "1")) so
+        # ancestor/prefix checks are tuple slices, not string splits and joins.
         root_by_path = {r['path']: r for r in roots}
+        root_by_tuple = {r['path_tuple']: r['path'] for r in roots}
+        # Proper prefix -> first root (in path order) underneath it
+        root_under_prefix = {}
+        for root in sorted(roots, key=lambda r: r['path']):
+            path_tuple = root['path_tuple']
+            for k in range(1, len(path_tuple)):
+                root_under_prefix.setdefault(path_tuple[:k], root['path'])
 
         def find_root_for(dep_path):
             """Find which root subtree contains dep_path."""
-            # Direct match — dep_path is itself a root
-            if dep_path in root_paths:
-                return dep_path
-            # Walk up parent chain
-            parts = dep_path.split('.')
-            while parts:
-                candidate = '.'.join(parts)
-                if candidate in root_paths:
-                    return candidate
-                # Check if any root is a prefix (child of a merged parent)
-                for rp in root_paths:
-                    if rp.startswith(candidate + '.') or rp == candidate:
-                        return rp
-                parts.pop()
-            # dep_path may be a prefix of root paths (e.g. depends_on "0" when roots are "0.0", "0.1")
-            matching = [rp for rp in root_paths if rp.startswith(dep_path + '.') or rp == dep_path]
-            return matching[0] if matching else None
+            # Walk up the parent chain: an exact root match, or a root that is a
+            # child of a merged parent (prefix match), at each level
+            dep_tuple = tuple(dep_path.split('.'))
+            for k in range(len(dep_tuple), 0, -1):
+                candidate = dep_tuple[:k]
+                if candidate in root_by_tuple:
+                    return root_by_tuple[candidate]
+                if candidate in root_under_prefix:
+                    return root_under_prefix[candidate]
+            return None
 
         # Build adjacency: root_path -> set of root_paths it must come after
         deps = {r['path']: set() for r in roots}
@@ -282,39 +394,54 @@ class TreeExecutor:
 
         self._state = self.RUNNING
 
-        while self.queue_position < len(self.queue) and not self.stop_requested:
-            entry = self.queue[self.queue_position]
-            block_path = entry['block_path']
-            idx = entry['composition_idx']
-            parent_key = entry['parent_key']
-
-            # Skip failed/blocked blocks
-            if block_path in self.failed_blocks or block_path in self.blocked_blocks:
-                self.queue_position += 1
+        # Hot-loop locals: skip repeated attribute lookups per composition
+        queue = self.queue
+        blocks = self.blocks
+        failed = self.failed_blocks
+        blocked = self.blocked_blocks
+        visited = self.visited_blocks
+        completed = self.block_completed
+        resolve_cache = self.resolve_cache
+        results = self.variation_results
+        exec_hook = self.pipeline.execute_hook
+        emit = self._emit
+        snapshot = self._snapshot
+        skip_to = self._skip_to
+
+        while self.queue_position < len(queue) and not self.stop_requested:
+            entry = queue[self.queue_position]
+            block_path, idx, parent_key, parent_block_path = entry
+
+            # Skip failed/blocked blocks — jump past the block's whole run, since
+            # the failure cascade has already blocked all of its descendants
+            if block_path in failed or block_path in blocked:
+                self.queue_position = skip_to[self.queue_position]
                 continue
 
             # Skip if parent block failed
-            if parent_key and parent_key.split(':')[0] in self.failed_blocks:
-                self.blocked_blocks.add(block_path)
-                self.block_states[block_path] = self.BLOCKED
-                self._emit('block_blocked', block_path)
+            if parent_block_path in failed:
+                blocked.add(block_path)
+                self._set_block_state(block_path, self.BLOCKED)
+                emit('block_blocked', block_path)
                 self.queue_position += 1
                 continue
 
-            block = self.blocks[block_path]
+            block = blocks[block_path]
 
             # Check depends_on — if any dependency failed, block this block
-            if block.get('depends_on') and block_path not in self.visited_blocks:
-                failed_deps = [d for d in block['depends_on'] if d in self.failed_blocks]
-                if failed_deps:
-                    self.blocked_blocks.add(block_path)
-                    self.block_states[block_path] = self.BLOCKED
-                    self._emit('block_blocked', block_path)
+            deps_set = block['_depends_on_set']
+            if deps_set and block_path not in visited:
+                if not deps_set.isdisjoint(failed):
+                    blocked.add(block_path)
+                    self._set_block_state(block_path, self.BLOCKED)
+                    emit('block_blocked', block_path)
                     self.queue_position += 1
                     continue
 
             # Build hook context
-            parent_result = self.variation_results.get(parent_key) if parent_key else None
+            parent_result = results.get(parent_key) if parent_key else None
+            if parent_result is not None and type(parent_result) is HookResult:
+                parent_result = parent_result.to_dict()
             job = block['jobs'][idx] if idx < len(block['jobs']) else block['jobs'][0]
             prompt = job['prompt']
 
@@ -322,40 +449,41 @@ class TreeExecutor:
                 'block_path': block_path,
                 'composition_index': idx,
                 'composition_total': block['compositions'],
-                'parent_result': parent_result.to_dict() if isinstance(parent_result, HookResult) else parent_result,
+                'parent_result': parent_result,
                 'resolved_text': prompt.get('text'),
                 'prompt_id': prompt.get('id'),
                 'annotations': prompt.get('_annotations'),
                 'job': job,
-                # Cross-block data flow (read-only copies)
-                'upstream_artifacts': {bp: list(arts) for bp, arts in self.block_artifacts.items()},
-                'block_states': dict(self.block_states),
-                'block_completed': dict(self.block_completed),
+                # Cross-block data flow (read-only snapshots)
+                'upstream_artifacts': self._artifacts_view_ro,
+                'block_states': snapshot('block_states'),
+                'block_completed': snapshot('block_completed'),
             }
 
             # Block-level hooks (fire once per block)
-            if block_path not in self.visited_blocks:
-                self.visited_blocks.add(block_path)
-                self.block_states[block_path] = self.RUNNING
-                self._emit('block_start', block_path)
+            if block_path not in visited:
+                visited.add(block_path)
+                self._set_block_state(block_path, self.RUNNING)
+                emit('block_start', block_path)
 
-                result = self.pipeline.execute_hook('node_start', ctx)
+                result = exec_hook('node_start', ctx)
                 if self.stop_requested:
                     break
                 if result.modify_context:
                     ctx.update(result.modify_context)
 
-                result = self.pipeline.execute_hook('resolve', ctx)
+                result = exec_hook('resolve', ctx)
                 if self.stop_requested:
                     break
                 if not result.success:
                     self._handle_failure(block_path, idx, result)
+                    self._release_parent_result(parent_key)
                     self.queue_position += 1
                     continue
-                self.resolve_cache[block_path] = result
+                resolve_cache[block_path] = result
 
             # Inject cached resolve data
-            cached = self.resolve_cache.get(block_path)
+            cached = resolve_cache.get(block_path)
             if cached and isinstance(cached, HookResult):
                 ctx['resolve_data'] = cached.data
             elif cached and isinstance(cached, dict):
@@ -364,8 +492,8 @@ class TreeExecutor:
             # Per-composition hooks
             composition_failed = False
             composition_data = {}  # Accumulate data across all stages
-            for stage in ('pre', 'generate', 'post'):
-                result = self.pipeline.execute_hook(stage, ctx)
+            for stage in _COMPOSITION_STAGES:
+                result = exec_hook(stage, ctx)
                 if self.stop_requested:
                     break
                 if not result.success:
@@ -382,6 +510,9 @@ class TreeExecutor:
             if self.stop_requested:
                 break
 
+            # This child is done with its parent's result (resume re-runs it otherwise)
+            self._release_parent_result(parent_key)
+
             if not composition_failed:
                 # Extract artifacts from hook return data
                 artifacts = composition_data.pop('artifacts', [])
@@ -391,39 +522,50 @@ class TreeExecutor:
                     artifact.setdefault('composition_idx', idx)
                     artifact.setdefault('block_path', block_path)
                 if artifacts:
-                    self.block_artifacts.setdefault(block_path, []).extend(artifacts)
+                    block_arts = self.block_artifacts.get(block_path)
+                    if block_arts is None:
+                        block_arts = self.block_artifacts[block_path] = []
+                        self._artifacts_view[block_path] = _ArtifactsView(block_arts)
+                    block_arts.extend(artifacts)
                     for artifact in artifacts:
-                        self._emit('artifact', block_path, idx, artifact)
+                        emit('artifact', block_path, idx, artifact)
 
                 # All three stages succeeded — store combined result
-                self.block_completed[block_path] = self.block_completed.get(block_path, 0) + 1
+                completed[block_path] = completed.get(block_path, 0) + 1
+                self._snapshots.pop('block_completed', None)
                 self.completed_compositions += 1
                 combined_result = HookResult(STATUS_SUCCESS, data=composition_data)
-                self.variation_results[f"{block_path}:{idx}"] = combined_result
-                self._emit('composition_complete', block_path, idx)
+                results[f"{block_path}:{idx}"] = combined_result
+                emit('composition_complete', block_path, idx)
 
                 # Block complete -> node_end
-                if self.block_completed[block_path] == block['compositions']:
-                    self.pipeline.execute_hook('node_end', ctx)
-                    self.block_states[block_path] = self.COMPLETE
-
-                    # Per-block artifact flush: write to disk immediately
-                    if self.block_artifacts.get(block_path) and self.output_path:
-                        self._flush_block_artifacts(block_path)
-
-                    # Emit artifact_consumed for blocks that have depends_on
-                    # (signals that this block's artifacts are now available to dependents)
-                    if self.block_artifacts.get(block_path):
-                        dependents = [b for b in self.blocks.values()
-                                      if block_path in b.get('depends_on', [])]
-                        for dep in dependents:
-                            self._emit('artifact_consumed', dep['path'], block_path,
-                                       len(self.block_artifacts[block_path]))
-
-                    self._emit('block_complete', block_path)
+                if completed[block_path] == block['compositions']:
+                    exec_hook('node_end', ctx)
+                    self._set_block_state(block_path, self.COMPLETE)
+
+                    block_arts = self.block_artifacts.get(block_path)
+                    if block_arts:
+                        # Per-block artifact flush: write to disk immediately
+                        if self.output_path:
+                            self._flush_block_artifacts(block_path)
+
+                        # Emit artifact_consumed for blocks that have depends_on
+                        # (signals that this block's artifacts are now available to dependents)
+                        dependents = self._dependents_of.get(block_path)
+                        if dependents:
+                            artifact_count = len(block_arts)
+                            for dep in dependents:
+                                emit('artifact_consumed', dep['path'], block_path, artifact_count)
+
+                    emit('block_complete', block_path)
 
             self.queue_position += 1
 
+        # Final indented manifest, unless the last write already was one -
+        # this is the run's final manifest write (callers don't repeat it)
+        if self._manifest_dirty or not self._manifest_pretty:
+            self._write_manifest(pretty=True)
+
         # Finalize state
         if self.stop_requested:
             self._state = self.PAUSED
@@ -444,27 +586,67 @@ class TreeExecutor:
     def _handle_failure(self, block_path: str, idx: int, result: HookResult):
         """Mark block as failed, cascade to all descendants and dependents."""
         self.failed_blocks.add(block_path)
-        self.block_states[block_path] = self.FAILED
+        self._set_block_state(block_path, self.FAILED)
         self.variation_results[f"{block_path}:{idx}"] = result
         error_msg = getattr(result, 'message', None)
         if error_msg is None and isinstance(getattr(result, 'error', None), dict):
             error_msg = result.error.get('message', 'Unknown error')
         self._emit('block_failed', block_path, error_msg)
 
-        # Cascade: block all children and dependents recursively
-        def cascade(failed_path):
-            # Block children (parent→child relationship)
-            children = [b for b in self.blocks.values() if b['parent_path'] == failed_path]
-            # Block dependents (depends_on relationship)
-            dependents = [b for b in self.blocks.values()
-                          if failed_path in b.get('depends_on', [])]
-            for block in children + dependents:
-                if block['path'] not in self.blocked_blocks:
-                    self.blocked_blocks.add(block['path'])
-                    self.block_states[block['path']] = self.BLOCKED
-                    self._emit('block_blocked', block['path'])
-                    cascade(block['path'])
-        cascade(block_path)
+        # Cascade: block all children and dependents, depth-first. An explicit
+        # stack of neighbour iterators keeps the recursive visit order without
+        # Python recursion; blocked_blocks doubles as the visited set.
+        def neighbours(path):
+            # Children (parent→child) first, then dependents (depends_on)
+            return itertools.chain(self._children_of.get(path, ()),
+                                   self._dependents_of.get(path, ()))
+
+        stack = [neighbours(block_path)]
+        while stack:
+            for block in stack[-1]:
+                path = block['path']
+                if path not in self.blocked_blocks:
+                    self.blocked_blocks.add(path)
+                    self._set_block_state(path, self.BLOCKED)
+                    self._emit('block_blocked', path)
+                    stack.append(neighbours(path))
+                    break
+            else:
+                stack.pop()
+
+    def _release_parent_result(self, parent_key: Optional[str]):
+        """
+        Drop a parent composition's result once its last child has consumed it.
+
+        Only immediate children read parent_result, so keeping every result for
+        the whole run would grow memory with the composition count. Leaf results
+        are never released.
+        """
+        if parent_key is None:
+            return
+        remaining = self._children_remaining.get(parent_key, 0) - 1
+        if remaining > 0:
+            self._children_remaining[parent_key] = remaining
+        else:
+            self._children_remaining.pop(parent_key, None)
+            self.variation_results.pop(parent_key, None)
+
+    def _set_block_state(self, block_path: str, state: str):
+        """Record a block state transition and invalidate the hook-facing snapshot."""
+        self.block_states[block_path] = state
+        self._snapshots.pop('block_states', None)
+
+    def _snapshot(self, name: str) -> MappingProxyType:
+        """
+        Read-only copy of block_states / block_completed for hooks.
+
+        Cached until the underlying attribute changes, so consecutive compositions
+        share one view instead of copying the dict per composition.
+        """
+        view = self._snapshots.get(name)
+        if view is None:
+            view = self._snapshots[name] = MappingProxyType(dict(getattr(self, name)))
+        return view
 
     def _emit(self, event_type: str, *args):
         """Emit progress event to callback."""
@@ -514,7 +696,7 @@ class TreeExecutor:
 
         Called after each block completes (not just at the end of execution).
         """
-        import json
+        import os
         from pathlib import Path
 
         if not self.output_path:
@@ -533,7 +715,10 @@ class TreeExecutor:
 
         for mod_id, mod_artifacts in by_mod.items():
             mod_dir = artifacts_root / mod_id
-            mod_dir.mkdir(parents=True, exist_ok=True)
+            self._ensure_dir(mod_dir)
+            artifact_dir = mod_dir / block_path
+            # disk_path strings are built from components, not Path.relative_to()
+            rel_mod_dir = os.path.join('_artifacts', mod_id)
 
             # Separate text vs binary artifacts
             text_arts = []
@@ -543,39 +728,52 @@ class TreeExecutor:
                     filename = artifact.get('name', '')
                     if not filename:
                         continue
-                    artifact_dir = mod_dir / block_path
-                    artifact_dir.mkdir(parents=True, exist_ok=True)
+                    self._ensure_dir(artifact_dir)
                     artifact_path = artifact_dir / filename
                     artifact_path.write_bytes(artifact['content_bytes'])
-                    artifact['disk_path'] = str(artifact_path.relative_to(Path(self.output_path)))
+                    artifact['disk_path'] = os.path.join(rel_mod_dir, block_path, filename)
                 else:
                     text_arts.append(artifact)
 
             # Consolidate text artifacts into JSONL (one file per mod per block)
             if text_arts:
                 jsonl_path = mod_dir / f'{block_path}.jsonl'
-                with open(jsonl_path, 'w') as f:
-                    for i, artifact in enumerate(text_arts):
-                        content = artifact.get('content') or artifact.get('preview', '')
-                        line = {
-                            'composition_idx': artifact.get('composition_idx', i),
-                            'name': artifact.get('name', ''),
-                            'content': str(content),
-                        }
-                        f.write(json.dumps(line) + '\n')
-
-                        # Set locator fields
-                        rel_path = str(jsonl_path.relative_to(Path(self.output_path)))
-                        artifact['disk_path'] = rel_path
-                        artifact['disk_line'] = i
-
-        # Update running manifest after each block
-        self._write_manifest()
-
-    def _write_manifest(self):
-        """Write/update _artifacts/manifest.json with current state."""
-        import json
-        import time
+                lines = [
+                    json_dumps({
+                        'composition_idx': artifact.get('composition_idx', i),
+                        'name': artifact.get('name', ''),
+                        'content': str(artifact.get('content') or artifact.get('preview', '')),
+                    })
+                    for i, artifact in enumerate(text_arts)
+                ]
+                # One buffered write for the whole block instead of one per line
+                with open(jsonl_path, 'wb', buffering=1 << 20) as f:
+                    f.write(b'\n'.join(lines) + b'\n')
+
+                # Set locator fields
+                rel_path = os.path.join(rel_mod_dir, f'{block_path}.jsonl')
+                for i, artifact in enumerate(text_arts):
+                    artifact['disk_path'] = rel_path
+                    artifact['disk_line'] = i
+
+        # Update running manifest, debounced — rewriting it re-serializes every
+        # artifact of every block, so skip rewrites that land too close together.
+        # execute() writes the final manifest once the queue is drained.
+        self._manifest_dirty = True
+        if time.monotonic() - self._manifest_last_write >= _MANIFEST_DEBOUNCE_S:
+            self._write_manifest()
+
+    def _ensure_dir(self, path):
+        """mkdir -p, skipping directories already created during this run."""
+        if path not in self._ensured_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(path)
+
+    def _write_manifest(self, pretty: bool = False):
+        """Write/update _artifacts/manifest.json with current state.
+
+        Mid-run writes are compact; pass pretty for the final, human-readable write.
+        """
         from pathlib import Path
 
         if not self.block_artifacts or not self.output_path:
@@ -601,12 +799,15 @@ class TreeExecutor:
             }
 
         manifest_dir = Path(self.output_path) / '_artifacts'
-        manifest_dir.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(manifest_dir)
         manifest_file = manifest_dir / 'manifest.json'
-        manifest_file.write_text(json.dumps(manifest, indent=2))
+        manifest_file.write_bytes(json_dumps(manifest, pretty=pretty))
+        self._manifest_last_write = time.monotonic()
+        self._manifest_dirty = False
+        self._manifest_pretty = pretty
         return manifest_file
 
     def write_manifest(self, output_path):
         """Write _artifacts/manifest.json with all collected artifacts (legacy API)."""
         self.output_path = output_path
-        return self._write_manifest()
+        return self._write_manifest(pretty=True)
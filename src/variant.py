@@ -18,11 +18,20 @@ USAGE:
     write_variant_json(structure, output_path)
 """
 
-import json
+import shutil
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+import yaml
+
+# libyaml-backed emitter/parser when PyYAML was built with it
+try:
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
+from src import fast_json
 from src.config import compute_job_hash
 from src.jobs import build_jobs
 from src.segments import SegmentRegistry, build_composition
@@ -102,7 +111,7 @@ def build_variant_structure(
     prompt_lookup = {}   # prompt_id -> index
     prompts_list = []    # index -> prompt_id
     
-    text_lookup = {}     # text_key -> index
+    text_lookup = {}     # (ext_key, text_var_idx, wc_key) tuple -> index
     texts_list = []      # index -> text_key
     
     config_lookup = {}   # config_key -> index
@@ -119,8 +128,47 @@ def build_variant_structure(
             lst.append(value)
         return lookup[value]
     
+    def format_text_key(ext_key, text_var_idx, wc_key):
+        """Render a text lookup tuple as its texts_list string."""
+        if ext_key:
+            parts = [f"ext_{k}[{v}]" for k, v in ext_key]
+        elif text_var_idx:
+            parts = [f"text[{text_var_idx}]"]
+        else:
+            parts = []
+        parts.extend(f"{wc_name}[{wc_idx}]" for wc_name, wc_idx in wc_key)
+        return "_".join(parts)
+    
     unique_pt = set()  # Track unique prompt+text combos for stacked view count
     
+    # Jobs sharing a prompt structure repeat the same keys - sort each set once
+    sorted_ext_cache = {}   # frozenset(ext_indices items) -> sorted tuple
+    sorted_wc_cache = {}    # frozenset(wildcard names) -> sorted tuple
+    
+    # Config values are collected in the same pass over jobs
+    config_values = {
+        'sampler': set(),
+        'scheduler': set(),
+        'lora': set(),
+        'cfg': set(),
+        'steps': set(),
+        'width': set(),
+        'height': set(),
+        'shift': set(),
+    }
+    sampler_values = config_values['sampler']
+    scheduler_values = config_values['scheduler']
+    lora_values = config_values['lora']
+    cfg_values = config_values['cfg']
+    steps_values = config_values['steps']
+    width_values = config_values['width']
+    height_values = config_values['height']
+    shift_values = config_values['shift']
+    default_cfg = default_params['cfg']
+    default_steps = default_params['steps']
+    default_width = default_params['width']
+    default_height = default_params['height']
+    
     for job in jobs:
         prompt_entry = job['prompt']
         prompt_id = prompt_entry.get('id', 'unknown')
@@ -129,31 +177,45 @@ def build_variant_structure(
         # P = prompt index
         p_idx = get_segment_idx(prompt_lookup, prompts_list, prompt_id)
         
-        # Build text variation key from ext_indices
+        # Build text variation key from ext_indices (tuples hash without
+        # formatting; the string form is only rendered for new entries)
         ext_indices = prompt_entry.get('_ext_indices')
         if ext_indices:
-            text_key = "_".join(f"ext_{k}[{v}]" for k, v in sorted(ext_indices.items()))
+            ext_items = frozenset(ext_indices.items())
+            ext_key = sorted_ext_cache.get(ext_items)
+            if ext_key is None:
+                ext_key = sorted_ext_cache[ext_items] = tuple(sorted(ext_items))
+            text_var_idx = 0
         else:
-            text_var_idx = prompt_entry.get('_text_variation_index', 0)
-            text_key = f"text[{text_var_idx}]" if text_var_idx else ""
+            ext_key = ()
+            text_var_idx = prompt_entry.get('_text_variation_index', 0) or 0
         
         # Extract wildcard usage
         wildcard_usage = prompt_entry.get('_wildcard_usage', {})
         
-        # Build wc_parts for text_key
-        wc_parts = []
-        for wc_name in sorted(wildcard_usage.keys()):
+        wc_names = frozenset(wildcard_usage)
+        sorted_wc_names = sorted_wc_cache.get(wc_names)
+        if sorted_wc_names is None:
+            sorted_wc_names = sorted_wc_cache[wc_names] = tuple(sorted(wc_names))
+        
+        wc_key = []
+        for wc_name in sorted_wc_names:
             wc_data = wildcard_usage[wc_name]
             if isinstance(wc_data, dict):
                 wc_idx = wc_data.get('index', 1)
             else:
                 wc_idx = wc_data
-            wc_parts.append(f"{wc_name}[{wc_idx}]")
+            wc_key.append((wc_name, wc_idx))
+        wc_key = tuple(wc_key)
         
-        if wc_parts:
-            text_key = text_key + "_" + "_".join(wc_parts) if text_key else "_".join(wc_parts)
-        
-        t_idx = get_segment_idx(text_lookup, texts_list, text_key) if text_key else 0
+        if ext_key or text_var_idx or wc_key:
+            text_key = (ext_key, text_var_idx, wc_key)
+            t_idx = text_lookup.get(text_key)
+            if t_idx is None:
+                t_idx = text_lookup[text_key] = len(texts_list)
+                texts_list.append(format_text_key(ext_key, text_var_idx, wc_key))
+        else:
+            t_idx = 0
         
         # Store reconstruction data for this text segment
         if t_idx not in ext_indices_map:
@@ -171,6 +233,22 @@ def build_variant_structure(
         c_idx = get_segment_idx(config_lookup, configs_list, config_key)
         
         unique_pt.add((p_idx, t_idx))
+        
+        # Collect config values
+        if sampler_name:
+            sampler_values.add(sampler_name)
+        if scheduler_type:
+            scheduler_values.add(scheduler_type)
+        lora_values.update(lora.get('alias', '') for lora in job.get('loras', ()))
+        
+        cfg_values.add(params.get('cfg', default_cfg))
+        steps_values.add(params.get('steps', default_steps))
+        width_values.add(params.get('width', default_width))
+        height_values.add(params.get('height', default_height))
+        
+        sampler_params = job.get('sampler_params', {})
+        if 'shift' in sampler_params:
+            shift_values.add(sampler_params['shift'])
     
     # =========================================================================
     # BUILD SEGMENT REGISTRY AND COMPOSITION
@@ -178,7 +256,9 @@ def build_variant_structure(
     
     segment_registry = SegmentRegistry.from_global_conf(global_conf)
     
-    # Build composition array
+    # Build composition array. Not memoized: every t is already a unique
+    # (ext, text variation, wildcard) key, so inputs seldom repeat, and entries
+    # shared between slots would be written as YAML anchors/aliases.
     max_t = len(texts_list)
     composition = []
     
@@ -189,39 +269,6 @@ def build_variant_structure(
         comp = build_composition(ext_indices, wc_usage, ann)
         composition.append(comp)
     
-    # =========================================================================
-    # EXTRACT CONFIG VALUES
-    # =========================================================================
-    
-    config_values = {
-        'sampler': set(),
-        'scheduler': set(),
-        'lora': set(),
-        'cfg': set(),
-        'steps': set(),
-        'width': set(),
-        'height': set(),
-        'shift': set(),
-    }
-    
-    for job in jobs:
-        if job.get('sampler'):
-            config_values['sampler'].add(job['sampler'])
-        if job.get('scheduler'):
-            config_values['scheduler'].add(job['scheduler'])
-        for lora in job.get('loras', []):
-            config_values['lora'].add(lora.get('alias', ''))
-        
-        params = job.get('params', {})
-        config_values['cfg'].add(params.get('cfg', default_params['cfg']))
-        config_values['steps'].add(params.get('steps', default_params['steps']))
-        config_values['width'].add(params.get('width', default_params['width']))
-        config_values['height'].add(params.get('height', default_params['height']))
-        
-        sampler_params = job.get('sampler_params', {})
-        if 'shift' in sampler_params:
-            config_values['shift'].add(sampler_params['shift'])
-    
     # =========================================================================
     # EXTRACT LORA DATA
     # =========================================================================
@@ -246,18 +293,14 @@ def build_variant_structure(
     # EXTRACT WILDCARDS FROM EXTENSIONS
     # =========================================================================
     
-    wildcards_dict = {}
+    wildcard_options = {}   # wc_name -> options (see _add_wildcard_options)
     for ext in global_conf.get('ext', []):
         if 'wildcards' in ext:
             for wc in ext['wildcards']:
                 wc_name = wc.get('name')
                 wc_options = wc.get('text', [])
                 if wc_name and wc_options:
-                    if wc_name in wildcards_dict:
-                        existing = set(wildcards_dict[wc_name])
-                        wildcards_dict[wc_name] = list(existing | set(wc_options))
-                    else:
-                        wildcards_dict[wc_name] = wc_options
+                    _add_wildcard_options(wildcard_options, wc_name, wc_options)
     
     # =========================================================================
     # EXTRACT WILDCARDS FROM INLINE PROMPT DEFINITIONS
@@ -269,11 +312,9 @@ def build_variant_structure(
             wc_name = wc.get('name')
             wc_options = wc.get('text', [])
             if wc_name and wc_options:
-                if wc_name in wildcards_dict:
-                    existing = set(wildcards_dict[wc_name])
-                    wildcards_dict[wc_name] = list(existing | set(wc_options))
-                else:
-                    wildcards_dict[wc_name] = wc_options
+                _add_wildcard_options(wildcard_options, wc_name, wc_options)
+    
+    wildcards_dict = {wc_name: list(options) for wc_name, options in wildcard_options.items()}
     
     # =========================================================================
     # BUILD FILENAME PATTERN
@@ -325,6 +366,25 @@ def build_variant_structure(
     return structure
 
 
+def _add_wildcard_options(wildcard_options: dict, wc_name: str, wc_options: list):
+    """Record one wildcard definition, merging repeated definitions of wc_name.
+
+    A single definition is kept exactly as authored - duplicates weight the
+    random pick and jobs record indices into this list. Once a second
+    definition arrives, options switch to an insertion-ordered dict (ordered
+    set) so merges dedupe in linear time and keep their first-seen order.
+    """
+    existing = wildcard_options.get(wc_name)
+    if existing is None:
+        wildcard_options[wc_name] = list(wc_options)
+    elif isinstance(existing, list):
+        merged = dict.fromkeys(existing)
+        merged.update(dict.fromkeys(wc_options))
+        wildcard_options[wc_name] = merged
+    else:
+        existing.update(dict.fromkeys(wc_options))
+
+
 def write_variant_json(structure: dict, output_path: Path) -> Path:
     """
     Write variant structure to JSON file.
@@ -339,8 +399,8 @@ def write_variant_json(structure: dict, output_path: Path) -> Path:
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(output_path, 'w') as f:
-        json.dump(structure, f, indent=2, default=str)
+    with open(output_path, 'wb') as f:
+        f.write(fast_json.dumps(structure, pretty=True, default=str))
     
     return output_path
 
@@ -362,8 +422,8 @@ def load_variant(variant_path: Path) -> dict:
     if not variant_path.exists():
         raise FileNotFoundError(f"Variant file not found: {variant_path}")
     
-    with open(variant_path, 'r') as f:
-        structure = json.load(f)
+    with open(variant_path, 'rb') as f:
+        structure = fast_json.loads(f.read())
     
     # Validate required keys
     required_keys = ['variant_id', 'job_config_hash', 'segments', 'total_images']
@@ -392,7 +452,10 @@ def get_variant_path(job_dir: Path, variant_id: str = "default") -> Path:
 # SPLIT YAML FORMAT
 # =============================================================================
 
-COMPOSITION_BATCH_SIZE = 500  # Items per composition batch file
+COMPOSITION_BATCH_SIZE = 500  # Items per composition batch document
+COMPOSITION_FILE = 'composition.yaml'  # Multi-document YAML, one document per batch
+COMPOSITION_INDEX_FILE = 'composition.idx'  # Byte offset of each batch document
+YAML_IO_BUFFER_SIZE = 1 << 16  # 64KB buffers for the large split YAML files
 
 
 def write_variant_yaml(structure: dict, output_dir: Path) -> Path:
@@ -404,10 +467,8 @@ def write_variant_yaml(structure: dict, output_dir: Path) -> Path:
         ├── variant.yaml      # Core config
         ├── wildcards.yaml    # Wildcard registry
         ├── segments.yaml     # Ext registry, prompts, configs
-        └── composition/      # Batched composition data
-            ├── c00000.yaml
-            ├── c00500.yaml
-            └── ...
+        ├── composition.yaml  # Batched composition data (one document per batch)
+        └── composition.idx   # Byte offset of each batch document
     
     Args:
         structure: Variant structure dictionary
@@ -416,8 +477,6 @@ def write_variant_yaml(structure: dict, output_dir: Path) -> Path:
     Returns:
         Path to output directory
     """
-    import yaml
-    
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     
@@ -440,13 +499,13 @@ def write_variant_yaml(structure: dict, output_dir: Path) -> Path:
         'lora_paths': structure.get('lora_paths', {}),
     }
     
-    with open(output_dir / 'variant.yaml', 'w') as f:
-        yaml.dump(variant_data, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+    with open(output_dir / 'variant.yaml', 'w', buffering=YAML_IO_BUFFER_SIZE) as f:
+        yaml.dump(variant_data, f, Dumper=SafeDumper, default_flow_style=False, allow_unicode=True, sort_keys=False)
     
     # 2. Write wildcards.yaml
     wildcards_data = structure.get('wildcards', {})
-    with open(output_dir / 'wildcards.yaml', 'w') as f:
-        yaml.dump(wildcards_data, f, default_flow_style=False, allow_unicode=True)
+    with open(output_dir / 'wildcards.yaml', 'w', buffering=YAML_IO_BUFFER_SIZE) as f:
+        yaml.dump(wildcards_data, f, Dumper=SafeDumper, default_flow_style=False, allow_unicode=True)
     
     # 3. Write segments.yaml (without composition - that's split separately)
     segments_data = {
@@ -458,24 +517,20 @@ def write_variant_yaml(structure: dict, output_dir: Path) -> Path:
         'resolution': segments.get('resolution', {'width': 1024, 'height': 1024}),
     }
     
-    # Add composition index
-    num_batches = (len(composition) + COMPOSITION_BATCH_SIZE - 1) // COMPOSITION_BATCH_SIZE
-    if num_batches > 0:
-        segments_data['composition_files'] = [
-            f"c{i * COMPOSITION_BATCH_SIZE:05d}.yaml" 
-            for i in range(num_batches)
-        ]
     segments_data['composition_count'] = len(composition)
     
-    with open(output_dir / 'segments.yaml', 'w') as f:
-        yaml.dump(segments_data, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
-    
-    # 4. Write composition batches
-    comp_dir = output_dir / 'composition'
-    comp_dir.mkdir(parents=True, exist_ok=True)
-    
-    for batch_idx in range(num_batches):
-        start = batch_idx * COMPOSITION_BATCH_SIZE
+    with open(output_dir / 'segments.yaml', 'w', buffering=YAML_IO_BUFFER_SIZE) as f:
+        yaml.dump(segments_data, f, Dumper=SafeDumper, default_flow_style=False, allow_unicode=True, sort_keys=False)
+    
+    # 4. Write composition batches as documents of a single file, recording
+    # each document's byte offset so load_composition_entry can seek to one
+    # batch without parsing the others. Batches are encoded serially: the
+    # libyaml emitter calls back into Python representers while holding the
+    # GIL, so a thread pool only adds contention.
+    offsets = []
+    documents = []
+    position = 0
+    for start in range(0, len(composition), COMPOSITION_BATCH_SIZE):
         end = min(start + COMPOSITION_BATCH_SIZE, len(composition))
         
         batch_data = {
@@ -483,13 +538,46 @@ def write_variant_yaml(structure: dict, output_dir: Path) -> Path:
             'items': composition[start:end]
         }
         
-        batch_file = comp_dir / f"c{start:05d}.yaml"
-        with open(batch_file, 'w') as f:
-            yaml.dump(batch_data, f, default_flow_style=False, allow_unicode=True)
+        # Items are small dicts of ints - flow style roughly halves the bytes
+        # emitted and parsed per batch
+        document = yaml.dump(batch_data, Dumper=SafeDumper, default_flow_style=True,
+                             allow_unicode=True, explicit_start=True, encoding='utf-8')
+        offsets.append(position)
+        documents.append(document)
+        position += len(document)
+    
+    # Rebuilding an unchanged job leaves both files (and their mtimes) untouched
+    _write_if_changed(output_dir / COMPOSITION_FILE, b"".join(documents))
+    _write_if_changed(output_dir / COMPOSITION_INDEX_FILE,
+                      "".join(f"{offset}\n" for offset in offsets).encode())
+    
+    # Drop batch files from the legacy composition/ layout so nothing reads
+    # them next to the new file
+    legacy_dir = output_dir / 'composition'
+    if legacy_dir.is_dir():
+        shutil.rmtree(legacy_dir)
     
     return output_dir
 
 
+def _write_if_changed(path: Path, data: bytes) -> bool:
+    """
+    Write data to path unless the file already holds exactly these bytes.
+    
+    Returns:
+        True if the file was written
+    """
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
+
+
 
 def load_variant_yaml(variant_dir: Path, load_composition: bool = True) -> dict:
     """
@@ -502,8 +590,6 @@ def load_variant_yaml(variant_dir: Path, load_composition: bool = True) -> dict:
     Returns:
         Complete job structure dictionary
     """
-    import yaml
-    
     variant_dir = Path(variant_dir)
     
     # Load consolidated index.yaml (replaces former variant.yaml)
@@ -514,32 +600,39 @@ def load_variant_yaml(variant_dir: Path, load_composition: bool = True) -> dict:
     if not index_path.exists():
         raise FileNotFoundError(f"Index file not found: {index_path}")
     
-    with open(index_path, 'r') as f:
-        structure = yaml.safe_load(f) or {}
+    with open(index_path, 'r', buffering=YAML_IO_BUFFER_SIZE) as f:
+        structure = yaml.load(f, Loader=SafeLoader) or {}
     
     # Load wildcards
     if wildcards_path.exists():
-        with open(wildcards_path, 'r') as f:
-            structure['wildcards'] = yaml.safe_load(f) or {}
+        with open(wildcards_path, 'r', buffering=YAML_IO_BUFFER_SIZE) as f:
+            structure['wildcards'] = yaml.load(f, Loader=SafeLoader) or {}
     
     # Load segments
     if segments_path.exists():
-        with open(segments_path, 'r') as f:
-            segments = yaml.safe_load(f) or {}
+        with open(segments_path, 'r', buffering=YAML_IO_BUFFER_SIZE) as f:
+            segments = yaml.load(f, Loader=SafeLoader) or {}
             structure['segments'] = segments
     
     # Load composition if requested
     if load_composition:
         composition = []
         comp_files = structure.get('segments', {}).get('composition_files', [])
-        comp_dir = variant_dir / 'composition'
+        comp_path = variant_dir / COMPOSITION_FILE
         
-        for comp_file in comp_files:
-            comp_path = comp_dir / comp_file
-            if comp_path.exists():
-                with open(comp_path, 'r') as f:
-                    batch = yaml.safe_load(f) or {}
-                    composition.extend(batch.get('items', []))
+        if comp_files:
+            # Legacy layout: one composition/cXXXXX.yaml file per batch
+            comp_dir = variant_dir / 'composition'
+            for comp_file in comp_files:
+                batch_path = comp_dir / comp_file
+                if batch_path.exists():
+                    with open(batch_path, 'r') as f:
+                        batch = yaml.load(f, Loader=SafeLoader) or {}
+                        composition.extend(batch.get('items', []))
+        elif comp_path.exists():
+            with open(comp_path, 'rb', buffering=YAML_IO_BUFFER_SIZE) as f:
+                for batch in yaml.load_all(f, Loader=SafeLoader):
+                    composition.extend((batch or {}).get('items', []))
         
         if 'segments' in structure:
             structure['segments']['composition'] = composition
@@ -558,18 +651,34 @@ def load_composition_entry(variant_dir: Path, t_idx: int) -> dict:
     Returns:
         Composition entry dict {ext: [...], wc: {...}}
     """
-    import yaml
-    
+    variant_dir = Path(variant_dir)
     batch_idx = t_idx // COMPOSITION_BATCH_SIZE
     local_idx = t_idx % COMPOSITION_BATCH_SIZE
     
-    comp_file = variant_dir / 'composition' / f"c{batch_idx * COMPOSITION_BATCH_SIZE:05d}.yaml"
-    
-    if not comp_file.exists():
-        return {'ext': [], 'wc': {}}
-    
-    with open(comp_file, 'r') as f:
-        batch = yaml.safe_load(f) or {}
+    index_path = variant_dir / COMPOSITION_INDEX_FILE
+    if index_path.exists():
+        with open(index_path, 'r') as f:
+            offsets = [int(line) for line in f if line.strip()]
+        if t_idx < 0 or batch_idx >= len(offsets):
+            return {'ext': [], 'wc': {}}
+        
+        # Read just this batch's document: from its offset to the next one
+        with open(variant_dir / COMPOSITION_FILE, 'rb') as f:
+            f.seek(offsets[batch_idx])
+            if batch_idx + 1 < len(offsets):
+                data = f.read(offsets[batch_idx + 1] - offsets[batch_idx])
+            else:
+                data = f.read()
+        batch = yaml.load(data, Loader=SafeLoader) or {}
+    else:
+        # Legacy layout: one composition/cXXXXX.yaml file per batch
+        comp_file = variant_dir / 'composition' / f"c{batch_idx * COMPOSITION_BATCH_SIZE:05d}.yaml"
+        
+        if not comp_file.exists():
+            return {'ext': [], 'wc': {}}
+        
+        with open(comp_file, 'r') as f:
+            batch = yaml.load(f, Loader=SafeLoader) or {}
     
     items = batch.get('items', [])
     if local_idx < len(items):
@@ -21,11 +21,33 @@ Usage:
     # Build full filename
     filename = build_content_filename(wc_hash, 0, 'base', 'euler', 'simple')
     # → "wc_7a2c1f_cfg0_base_euler_simple.png"
+
+Hash Algorithm:
+    MD5 by default. Hashes are persisted in data.json and image filenames,
+    so changing the algorithm orphans existing outputs. Set PROMPTYUI_HASH=xxh3
+    (requires the optional xxhash package) to opt in to the faster xxh3_64
+    hash for new jobs only.
 """
 
+import functools
 import hashlib
 import json
-from typing import Dict, Optional
+import os
+import re
+from json.encoder import encode_basestring_ascii
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+_HASH_ALGO = os.environ.get('PROMPTYUI_HASH', 'md5').lower()
+if _HASH_ALGO == 'xxh3' and xxhash is None:
+    raise ImportError("PROMPTYUI_HASH=xxh3 requires the xxhash package (pip install xxhash)")
+
+# Match wc_{6-char-hash}_cfg{digit}...
+_WC_FILENAME_RE = re.compile(r'^wc_([a-f0-9]{6})_cfg\d+')
 
 
 def compute_wc_hash(wc_dict: Optional[Dict[str, int]] = None,
@@ -52,13 +74,49 @@ def compute_wc_hash(wc_dict: Optional[Dict[str, int]] = None,
         compute_wc_hash(None, None)                                # → "d41d8c" (null)
         compute_wc_hash({}, {})                                    # → "d41d8c" (empty = null)
     """
+    # Canonical (sorted) item tuples make equal dicts share one cache entry.
+    # Only plain str -> int items are cached: 1, 1.0 and True compare equal as
+    # keys but serialize differently.
+    wc_items = tuple(sorted(wc_dict.items())) if wc_dict else ()
+    ext_items = tuple(sorted(ext_indices.items())) if ext_indices else ()
+    if all(type(k) is str and type(v) is int for k, v in wc_items + ext_items):
+        return _compute_wc_hash_cached(wc_items, ext_items)
+    return _hash_content(wc_dict or {}, ext_indices or {})
+
+
+@functools.lru_cache(maxsize=65536)
+def _compute_wc_hash_cached(wc_items: tuple, ext_items: tuple) -> str:
+    """Memoized compute_wc_hash body, keyed on sorted str -> int item tuples."""
+    return _digest(_canonical_json(wc_items, ext_items).encode())
+
+
+def _canonical_json(wc_items: tuple, ext_items: tuple) -> str:
+    """
+    Render sorted str->int items exactly as json.dumps(content, sort_keys=True).
+
+    Hashes are persisted, so this must stay byte-identical to the json output:
+    default ', ' / ': ' separators, ASCII-escaped keys, "ext" before "wc".
+    """
+    ext = ", ".join(f"{encode_basestring_ascii(k)}: {v}" for k, v in ext_items)
+    wc = ", ".join(f"{encode_basestring_ascii(k)}: {v}" for k, v in wc_items)
+    return f'{{"ext": {{{ext}}}, "wc": {{{wc}}}}}'
+
+
+def _hash_content(wc_dict: Dict[str, int], ext_indices: Dict[str, int]) -> str:
+    """Hash the canonical JSON of {'wc': ..., 'ext': ...}."""
     content = {
-        'wc': wc_dict or {},
-        'ext': ext_indices or {}
+        'wc': wc_dict,
+        'ext': ext_indices
     }
     # sort_keys ensures deterministic serialization
-    data = json.dumps(content, sort_keys=True)
-    return hashlib.md5(data.encode()).hexdigest()[:6]
+    return _digest(json.dumps(content, sort_keys=True).encode())
+
+
+def _digest(data: bytes) -> str:
+    """First 6 hex chars of the configured hash of data."""
+    if _HASH_ALGO == 'xxh3':
+        return xxhash.xxh3_64_hexdigest(data)[:6]
+    return hashlib.md5(data).hexdigest()[:6]
 
 
 def build_content_filename(wc_hash: str, config_index: int, suffix: str,
@@ -109,14 +167,26 @@ def parse_wc_hash_from_filename(filename: str) -> Optional[str]:
     Returns:
         Hash string like "7a2c1f", or None if not a hash-based filename
     """
-    import re
-    # Match wc_{6-char-hash}_cfg{digit}...
-    match = re.match(r'^wc_([a-f0-9]{6})_cfg\d+', filename)
+    match = _WC_FILENAME_RE.match(filename)
     if match:
         return match.group(1)
     return None
 
 
+def parse_wc_hashes_from_filenames(filenames: Iterable[str]) -> List[Optional[str]]:
+    """
+    Extract wc_hash from many filenames (bulk directory scans).
+
+    Args:
+        filenames: Iterable of filenames
+
+    Returns:
+        List of hash strings (or None for non-hash filenames), in input order
+    """
+    match = _WC_FILENAME_RE.match
+    return [m.group(1) if m else None for m in map(match, filenames)]
+
+
 def is_hash_based_filename(filename: str) -> bool:
     """
     Check if a filename uses the new hash-based format.
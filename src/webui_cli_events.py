@@ -42,9 +42,28 @@ AGENT-BROWSER DEBUGGING:
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 from dataclasses import dataclass
-import json
+import functools
+import mmap
+import os
+import struct
+import sys
 import time
 
+from src.fast_json import loads as json_loads
+
+# Optional: inotify lets wait_for_event block until events.log changes instead
+# of polling every 100ms (Linux only; falls back to polling when missing)
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+
+# Optional: msgpack decodes binary events.log files (see EVENTS_LOG_MAGIC)
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 # =============================================================================
 # EVENT TYPE CONSTANTS
 # =============================================================================
@@ -58,13 +77,19 @@ EVENT_IMAGE_COMPLETE = 'image_complete'
 EVENT_WORKER = 'worker'
 EVENT_MOD_UI = 'mod_ui'
 
+# events.log is JSON-per-line by default. A log that starts with this magic is
+# binary instead: each record is a little-endian u32 length followed by a
+# msgpack map with the same keys (ts, src, evt, data).
+EVENTS_LOG_MAGIC = b'PYEVLOG1'
+_RECORD_LEN = struct.Struct('<I')
+
 # =============================================================================
 # EVENT DATA STRUCTURES
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class EventRecord:
-    """Single event record from events.log."""
+    """Single event record from events.log (slotted - logs can hold many)."""
     timestamp: float
     source: str  # 'cli', 'worker', 'mod', etc.
     event_type: str
@@ -135,6 +160,86 @@ def push_image_complete(filename: str, relative_path: str, image_url: str,
 # EVENT VERIFICATION UTILITIES (FOR TESTS)
 # =============================================================================
 
+def _to_event_record(raw: dict) -> EventRecord:
+    """Build an EventRecord from a decoded events.log entry.
+
+    source and event_type come from a handful of values, so they are interned
+    to share one string object per value across the log.
+    """
+    source = raw.get('src', 'unknown')
+    event_type = raw.get('evt', '')
+    return EventRecord(
+        timestamp=raw.get('ts', 0),
+        source=sys.intern(source) if type(source) is str else source,
+        event_type=sys.intern(event_type) if type(event_type) is str else event_type,
+        data=raw.get('data', {})
+    )
+
+@functools.lru_cache(maxsize=64)
+def _event_type_needles(event_type: str) -> tuple:
+    """Bytes every JSON line / msgpack record of event_type must contain.
+
+    JSON lines contain the quoted type whatever the writer's spacing; msgpack
+    stores strings as raw UTF-8. A type JSON would escape (quotes, control or
+    non-ASCII characters) may be written either way, so it gets no JSON
+    needle and every line is parsed.
+    """
+    import json
+    quoted = f'"{event_type}"'
+    json_needle = quoted.encode() if json.dumps(event_type) == quoted else None
+    return json_needle, event_type.encode('utf-8')
+
+def _parse_event_lines(lines: List[bytes], needle: Optional[bytes] = None) -> List[EventRecord]:
+    """Parse events.log lines into EventRecords (file order, bad lines skipped).
+
+    Lines not containing needle are skipped without being decoded.
+    """
+    events = []
+    for line in lines:
+        if needle is not None and needle not in line:
+            continue
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            events.append(_to_event_record(json_loads(line)))
+        except ValueError:
+            continue
+    return events
+
+def _require_msgpack():
+    """Raise ImportError if a binary events.log is read without msgpack."""
+    if msgpack is None:
+        raise ImportError("events.log is in binary format but msgpack is not installed. "
+                          "Install it with: pip install msgpack")
+
+def _parse_event_records(buf, offset: int = 0, needle: Optional[bytes] = None) -> tuple:
+    """Parse length-prefixed msgpack records from buf starting at offset.
+
+    Returns (events, end) where end is the offset just past the last complete
+    record - a record still being written is left for the next read. Records
+    not containing needle are skipped without being decoded.
+    """
+    _require_msgpack()
+    events = []
+    size = len(buf)
+    header = _RECORD_LEN.size
+    while offset + header <= size:
+        (length,) = _RECORD_LEN.unpack_from(buf, offset)
+        end = offset + header + length
+        if end > size:
+            break
+        record = buf[offset + header:end]
+        if needle is not None and needle not in record:
+            offset = end
+            continue
+        try:
+            events.append(_to_event_record(msgpack.unpackb(record, raw=False)))
+        except (ValueError, AttributeError):
+            pass  # Corrupt record - skip it, the length prefix keeps us in sync
+        offset = end
+    return events, offset
+
 def read_events_log(job_dir: Path) -> List[EventRecord]:
     """Read all events from events.log file.
 
@@ -144,25 +249,108 @@ def read_events_log(job_dir: Path) -> List[EventRecord]:
     if not events_file.exists():
         return []
 
-    events = []
-    with open(events_file, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                raw = json.loads(line)
-                events.append(EventRecord(
-                    timestamp=raw.get('ts', 0),
-                    source=raw.get('src', 'unknown'),
-                    event_type=raw.get('evt', ''),
-                    data=raw.get('data', {})
-                ))
-            except json.JSONDecodeError:
-                continue
-
+    with open(events_file, 'rb') as f:
+        if f.read(len(EVENTS_LOG_MAGIC)) == EVENTS_LOG_MAGIC:
+            # Binary log: decode records straight out of the page cache
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                events, _ = _parse_event_records(mm, len(EVENTS_LOG_MAGIC))
+        else:
+            f.seek(0)
+            events = _parse_event_lines(f.read().split(b'\n'))
     return sorted(events, key=lambda e: e.timestamp)
 
+class EventsTail:
+    """Incremental events.log reader.
+
+    Each read() parses only the complete lines (or binary records) appended
+    since the previous call; a trailing partial one is held back until it has
+    been fully written. If the log is truncated or recreated, reading
+    restarts from the top.
+    """
+
+    def __init__(self, job_dir: Path):
+        self.path = job_dir / 'tmp' / 'events.log'
+        self.offset = 0
+        self._partial = b''
+        self._binary = None  # Decided from the first bytes of the log
+
+    def read(self, event_type: Optional[str] = None) -> List[EventRecord]:
+        """Return events appended since the last read, in file order.
+
+        With event_type, only events of that type are returned, and lines that
+        cannot contain it are skipped before JSON/msgpack decoding.
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size < self.offset:
+                    self.offset = 0
+                    self._partial = b''
+                    self._binary = None
+                f.seek(self.offset)
+                chunk = f.read()
+                self.offset = f.tell()
+        except FileNotFoundError:
+            return []
+
+        if not chunk:
+            return []
+        data = self._partial + chunk
+        if self._binary is None:
+            magic_len = len(EVENTS_LOG_MAGIC)
+            if len(data) < magic_len and EVENTS_LOG_MAGIC.startswith(data):
+                self._partial = data  # Too short to tell yet
+                return []
+            self._binary = data[:magic_len] == EVENTS_LOG_MAGIC
+            if self._binary:
+                data = data[magic_len:]
+
+        json_needle = binary_needle = None
+        if event_type is not None:
+            json_needle, binary_needle = _event_type_needles(event_type)
+
+        if self._binary:
+            events, end = _parse_event_records(data, needle=binary_needle)
+            self._partial = data[end:]
+        else:
+            lines = data.split(b'\n')
+            self._partial = lines.pop()
+            events = _parse_event_lines(lines, needle=json_needle)
+        if event_type is not None:
+            # The needle only prefilters - it can also match inside data
+            events = get_events_by_type(events, event_type)
+        return events
+
+class EventsIndex:
+    """Events grouped by type and by source for repeated lookups.
+
+    get_events_by_type/get_events_by_source scan the whole list on every
+    call; tests that query the same log many times can build one index and
+    look up each type or source directly. Lists keep the input order.
+
+    Usage:
+        index = EventsIndex(read_events_log(job_dir))
+        assert len(index.get_events_by_type('job_start')) == 1
+    """
+
+    def __init__(self, events: List[EventRecord] = ()):
+        self.by_type: Dict[str, List[EventRecord]] = {}
+        self.by_source: Dict[str, List[EventRecord]] = {}
+        self.add(events)
+
+    def add(self, events: List[EventRecord]):
+        """Index more events (e.g. the output of EventsTail.read())."""
+        for e in events:
+            self.by_type.setdefault(e.event_type, []).append(e)
+            self.by_source.setdefault(e.source, []).append(e)
+
+    def get_events_by_type(self, event_type: str) -> List[EventRecord]:
+        """Events of one type (empty list if none)."""
+        return self.by_type.get(event_type, [])
+
+    def get_events_by_source(self, source: str) -> List[EventRecord]:
+        """Events from one source (empty list if none)."""
+        return self.by_source.get(source, [])
+
 def get_events_by_type(events: List[EventRecord], event_type: str) -> List[EventRecord]:
     """Filter events by type."""
     return [e for e in events if e.event_type == event_type]
@@ -178,31 +366,57 @@ def wait_for_event(job_dir: Path, event_type: str, timeout: float = 10.0) -> Opt
     Returns the first matching event, or None if timeout.
     """
     start_time = time.time()
-    seen_count = 0
-
-    while time.time() - start_time < timeout:
-        events = read_events_log(job_dir)
-        matches = get_events_by_type(events, event_type)
+    tail = EventsTail(job_dir)
+    watcher = _watch_events_dir(job_dir)
 
-        if len(matches) > seen_count:
-            return matches[-1]  # Return newest event
-
-        time.sleep(0.1)
+    try:
+        while time.time() - start_time < timeout:
+            # Only newly appended lines that mention event_type are parsed
+            matches = tail.read(event_type)
+
+            if matches:
+                return sorted(matches, key=lambda e: e.timestamp)[-1]  # Return newest event
+
+            if watcher is not None:
+                # Wake as soon as tmp/ changes, or when the timeout runs out
+                remaining = timeout - (time.time() - start_time)
+                watcher.read(timeout=max(1, int(remaining * 1000)))
+            else:
+                time.sleep(0.1)
+    finally:
+        if watcher is not None:
+            watcher.close()
 
     return None
 
+def _watch_events_dir(job_dir: Path):
+    """Open an inotify watch on job_dir/tmp, or None to fall back to polling."""
+    if INotify is None:
+        return None
+    watcher = None
+    try:
+        watcher = INotify()
+        watcher.add_watch(str(job_dir / 'tmp'),
+                          inotify_flags.MODIFY | inotify_flags.CREATE | inotify_flags.MOVED_TO)
+        return watcher
+    except OSError:
+        # No tmp/ yet, or inotify unavailable/exhausted
+        if watcher is not None:
+            watcher.close()
+        return None
+
 def verify_event_sequence(events: List[EventRecord], expected_types: List[str]) -> bool:
     """Verify events occur in expected order.
 
     Returns True if event types appear in the expected sequence (not necessarily consecutive).
     """
-    event_types = [e.event_type for e in events]
-
-    idx = 0
+    # One shared iterator: each expected type resumes after the previous match
+    remaining = iter(events)
     for expected in expected_types:
-        try:
-            idx = event_types.index(expected, idx)
-        except ValueError:
+        for e in remaining:
+            if e.event_type == expected:
+                break
+        else:
             return False
 
     return True
@@ -211,15 +425,20 @@ def verify_event_sequence(events: List[EventRecord], expected_types: List[str])
 # AGENT-BROWSER DEBUGGING UTILITIES
 # =============================================================================
 
+@functools.lru_cache(maxsize=1)
 def verify_agent_browser_available() -> bool:
-    """Check if agent-browser is available for visual debugging."""
+    """Check if agent-browser is available for visual debugging (cached)."""
+    import shutil
+    return shutil.which('agent-browser') is not None
+
+def _run_agent_browser(args: List[str], timeout: float):
+    """Run one agent-browser command, returning the CompletedProcess or None."""
     import subprocess
     try:
-        result = subprocess.run(['which', 'agent-browser'],
-                              capture_output=True, timeout=2)
-        return result.returncode == 0
+        return subprocess.run(['agent-browser', *args],
+                              capture_output=True, text=True, timeout=timeout)
     except Exception:
-        return False
+        return None
 
 def capture_webui_state(port: int, output_dir: Path, prefix: str = 'debug') -> Dict[str, str]:
     """Capture WebUI state using agent-browser for debugging.
@@ -235,50 +454,40 @@ def capture_webui_state(port: int, output_dir: Path, prefix: str = 'debug') -> D
     if not verify_agent_browser_available():
         return {}
 
-    import subprocess
+    from concurrent.futures import ThreadPoolExecutor
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    result = {}
-
-    # Take screenshot
     screenshot_path = output_dir / f'{prefix}_screenshot.png'
-    try:
-        subprocess.run(['agent-browser', 'screenshot', str(screenshot_path)],
-                      capture_output=True, timeout=10)
-        if screenshot_path.exists():
-            result['screenshot'] = str(screenshot_path)
-    except Exception:
-        pass
-
-    # Capture console output
-    console_path = output_dir / f'{prefix}_console.txt'
-    try:
-        proc = subprocess.run(['agent-browser', 'console'],
-                            capture_output=True, text=True, timeout=5)
-        console_path.write_text(proc.stdout)
-        result['console'] = str(console_path)
-    except Exception:
-        pass
-
-    # Capture errors
-    errors_path = output_dir / f'{prefix}_errors.txt'
-    try:
-        proc = subprocess.run(['agent-browser', 'errors'],
-                            capture_output=True, text=True, timeout=5)
-        errors_path.write_text(proc.stdout)
-        result['errors'] = str(errors_path)
-    except Exception:
-        pass
+    # name -> (agent-browser args, timeout, file to write stdout to)
+    captures = {
+        'screenshot': (['screenshot', str(screenshot_path)], 10, None),
+        'console': (['console'], 5, output_dir / f'{prefix}_console.txt'),
+        'errors': (['errors'], 5, output_dir / f'{prefix}_errors.txt'),
+        'snapshot': (['snapshot', '-i'], 5, output_dir / f'{prefix}_snapshot.txt'),
+    }
+
+    # The four commands each wait on the browser - run them concurrently
+    with ThreadPoolExecutor(max_workers=len(captures)) as executor:
+        futures = {
+            name: executor.submit(_run_agent_browser, args, timeout)
+            for name, (args, timeout, _) in captures.items()
+        }
 
-    # Capture interactive snapshot
-    snapshot_path = output_dir / f'{prefix}_snapshot.txt'
-    try:
-        proc = subprocess.run(['agent-browser', 'snapshot', '-i'],
-                            capture_output=True, text=True, timeout=5)
-        snapshot_path.write_text(proc.stdout)
-        result['snapshot'] = str(snapshot_path)
-    except Exception:
-        pass
+    result = {}
+    for name, (_, _, output_path) in captures.items():
+        proc = futures[name].result()
+        if proc is None:
+            continue
+        if output_path is None:
+            # Screenshot is written by agent-browser itself
+            if screenshot_path.exists():
+                result[name] = str(screenshot_path)
+            continue
+        try:
+            output_path.write_text(proc.stdout)
+            result[name] = str(output_path)
+        except Exception:
+            pass
 
     return result
 
@@ -19,33 +19,222 @@ Usage in hooks:
         })
         
         return {'status': 'success'}
+
+Pushes are fire-and-forget: they are queued and POSTed in order by a single
+background thread, so callers never wait on the WebUI. Pending events are
+flushed at interpreter exit; call flush_events() to wait for them earlier.
+Because pushes only enqueue, they are also safe to call from asyncio code -
+there is no separate async API. Events drained together go out as one batch
+POST, so a burst of pushes costs about one round trip over one connection.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+import urllib3
+import atexit
+import functools
+import gzip
 import os
 import logging
-from typing import Optional
+import queue
+import socket
+import threading
+import time
+from collections import namedtuple
+from typing import Dict, List, Optional
+
+from src.fast_json import dumps as json_dumps
 
 # Create logger (only if WEBUI_DEBUG is set)
 _debug = os.environ.get('WEBUI_DEBUG', '').lower() in ('1', 'true', 'yes')
 _logger = logging.getLogger('webui_events') if _debug else None
 
+# Shared keep-alive session - one TCP connection reused across pushes instead
+# of a new connection per event (created on first push)
+_session: Optional[requests.Session] = None
+
+# Background delivery: queued events are drained by one daemon worker. When
+# the queue is full (WebUI stalled), new events are dropped.
+EVENT_QUEUE_SIZE = 1024
+FLUSH_TIMEOUT_S = 2.0
+
+# Consecutive event pushes drained together are sent as one NDJSON POST to
+# /api/event/push_batch. Servers without that endpoint (404, or 405/501 from
+# servers that don't route unknown POSTs) get single pushes.
+EVENT_PATH = '/api/event/push'
+EVENT_BATCH_PATH = '/api/event/push_batch'
+EVENT_BATCH_MAX = 64
+EVENT_BATCH_MAX_BYTES = 256 * 1024
+EVENT_BATCH_UNSUPPORTED_STATUSES = (404, 405, 501)
+_batch_supported = True
+
+# Batch bodies above this size are gzipped (level 1 - cheap, still ~4x on
+# repetitive event JSON). A server that rejects the gzipped batch (400/415)
+# but accepts it uncompressed gets uncompressed batches from then on.
+EVENT_BATCH_GZIP_MIN_BYTES = 4096
+_batch_gzip_supported = True
+
+# body is the payload serialized at push time, so later changes to the
+# caller's dict can't leak into the sent event; event_type is set for
+# push_event (debug logging of delivery)
+_QueuedEvent = namedtuple('_QueuedEvent', 'port path body headers event_type')
+
+# WebUI reachability by port, probed once by the worker before its first
+# delivery. Pushes to a port known to be down return without queuing, so runs
+# without a WebUI don't pay a failed connect per event. PROMPTY_WEBUI_DISABLED=1
+# turns all pushes off without probing.
+WEBUI_PROBE_TIMEOUT_S = 1.0
+_webui_enabled: Dict[int, bool] = {}
+
+# A WebUI server may also listen on a Unix socket next to its TCP port. When
+# ~/.prompty/webui-{port}.sock accepts connections, pushes to that port go over
+# it (same URLs and HTTP requests, no loopback TCP stack).
+WEBUI_SOCKET_DIR = os.path.join('~', '.prompty')
+
+_event_queue: queue.Queue = queue.Queue(maxsize=EVENT_QUEUE_SIZE)
+_worker: Optional[threading.Thread] = None
+_worker_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """Get the shared HTTP session, creating it on first use."""
+    global _session
+    if _session is None:
+        session = requests.Session()
+        session.mount('http://', HTTPAdapter(pool_connections=2, pool_maxsize=8))
+        _session = session
+    return _session
+
+
+# =============================================================================
+# UNIX SOCKET TRANSPORT
+# =============================================================================
+
+class _UnixHTTPConnection(urllib3.connection.HTTPConnection):
+    """urllib3 connection that connects to a Unix socket instead of host:port."""
+
+    def __init__(self, socket_path: str, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.socket_path = socket_path
+
+    def _new_conn(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if isinstance(self.timeout, (int, float)):
+            sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError as e:
+            sock.close()
+            raise urllib3.exceptions.NewConnectionError(
+                self, f"Failed to connect to {self.socket_path}: {e}") from e
+        return sock
+
+
+class _UnixHTTPConnectionPool(urllib3.HTTPConnectionPool):
+    """Connection pool whose connections all go to one Unix socket."""
+
+    def __init__(self, socket_path: str, **kwargs):
+        super().__init__('localhost', **kwargs)
+        self.socket_path = socket_path
+
+    def _new_conn(self) -> _UnixHTTPConnection:
+        self.num_connections += 1
+        return _UnixHTTPConnection(self.socket_path, host='localhost',
+                                   timeout=self.timeout.connect_timeout)
+
+
+class _UnixSocketAdapter(HTTPAdapter):
+    """requests adapter routing every request through one Unix socket."""
+
+    def __init__(self, socket_path: str, **kwargs):
+        self._pool = _UnixHTTPConnectionPool(socket_path, maxsize=kwargs.get('pool_maxsize', 8))
+        super().__init__(**kwargs)
+
+    def get_connection_with_tls_context(self, request, verify, proxies=None, cert=None):
+        return self._pool
+
+    def get_connection(self, url, proxies=None):
+        return self._pool
+
+    def close(self):
+        self._pool.close()
+        super().close()
+
 
+def _get_socket_path(port: int) -> Optional[str]:
+    """Path of the WebUI's Unix socket for port, if one is accepting connections."""
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    path = os.path.expanduser(os.path.join(WEBUI_SOCKET_DIR, f'webui-{port}.sock'))
+    if not os.path.exists(path):
+        return None
+    # A stale socket file (server gone) must not swallow events TCP could deliver
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.settimeout(WEBUI_PROBE_TIMEOUT_S)
+        probe.connect(path)
+        return path
+    except OSError:
+        return None
+    finally:
+        probe.close()
+
+
+def _mount_socket_transport(port: int):
+    """Send this port's pushes over its Unix socket when the server has one."""
+    socket_path = _get_socket_path(port)
+    if socket_path is None:
+        return
+    _get_session().mount(f'{_get_base_url(port)}/',
+                         _UnixSocketAdapter(socket_path, pool_connections=1, pool_maxsize=8))
+    if _logger is not None:
+        _logger.info("Using Unix socket %s for WebUI port %d", socket_path, port)
+
+
+# Port, trace id, headers and URLs are derived from the environment once per
+# process (the CLI sets WEBUI_PORT/DEBUG_ID before the first push).
+# invalidate_webui_cache() re-reads them.
+
+@functools.lru_cache(maxsize=None)
+def _get_base_url(port: int) -> str:
+    """Get 'http://localhost:{port}' (cached per port)."""
+    return f'http://localhost:{port}'
+
+
+@functools.lru_cache(maxsize=None)
+def _get_url(port: int, path: str) -> str:
+    """Get the full URL for an endpoint path (cached)."""
+    return f'{_get_base_url(port)}{path}'
+
+
+@functools.lru_cache(maxsize=1)
 def _get_webui_port() -> Optional[int]:
     """Get WebUI port from environment or default to 8084."""
     return int(os.environ.get('WEBUI_PORT', '8084'))
 
 
+@functools.lru_cache(maxsize=1)
 def _get_trace_id() -> Optional[str]:
     """Get trace-id from DEBUG_ID environment variable."""
     return os.environ.get('DEBUG_ID')
 
 
-def test_webui_connection(port: int = None) -> tuple[bool, str]:
+@functools.lru_cache(maxsize=1)
+def _base_headers() -> dict:
+    """Get the headers sent with every push (shared - do not mutate)."""
+    headers = {'Content-Type': 'application/json'}
+    trace_id = _get_trace_id()
+    if trace_id:
+        headers['X-Trace-ID'] = trace_id
+    return headers
+
+
+def test_webui_connection(port: int = None, timeout: float = 2) -> tuple[bool, str]:
     """Test if WebUI server is reachable.
 
     Args:
         port: Port to test (if None, uses _get_webui_port())
+        timeout: Request timeout in seconds
 
     Returns:
         (is_connected, message)
@@ -58,7 +247,7 @@ def test_webui_connection(port: int = None) -> tuple[bool, str]:
     try:
         response = requests.get(
             f'http://localhost:{port}/api/config',
-            timeout=2
+            timeout=timeout
         )
         if response.status_code == 200:
             config = response.json()
@@ -73,6 +262,217 @@ def test_webui_connection(port: int = None) -> tuple[bool, str]:
         return False, f"Connection failed: {str(e)}"
 
 
+def _ensure_worker():
+    """Start the delivery thread if it isn't running (first push, or after fork)."""
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            if _worker is None:
+                atexit.register(flush_events)
+            _worker = threading.Thread(target=_worker_loop, name='webui-events', daemon=True)
+            _worker.start()
+
+
+def _worker_loop():
+    """Drain the event queue, delivering up to EVENT_BATCH_MAX events at a time."""
+    while True:
+        items = [_event_queue.get()]
+        while len(items) < EVENT_BATCH_MAX:
+            try:
+                items.append(_event_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            _deliver(items)
+        except Exception as e:
+            # One bad batch must not stop the worker - events are non-critical
+            if _logger is not None:
+                _logger.warning("Failed to deliver %d events: %s", len(items), e)
+        finally:
+            for _ in items:
+                _event_queue.task_done()
+
+
+@functools.lru_cache(maxsize=1)
+def _webui_disabled_by_env() -> bool:
+    """Check the PROMPTY_WEBUI_DISABLED kill switch."""
+    return os.environ.get('PROMPTY_WEBUI_DISABLED', '').lower() in ('1', 'true', 'yes')
+
+
+def _ensure_enabled(port: int) -> bool:
+    """Whether the WebUI on port is reachable (probed once, then cached)."""
+    enabled = _webui_enabled.get(port)
+    if enabled is None:
+        enabled = _webui_enabled[port] = test_webui_connection(port, timeout=WEBUI_PROBE_TIMEOUT_S)[0]
+        if enabled:
+            _mount_socket_transport(port)
+        elif _logger is not None:
+            _logger.info("No WebUI on port %d, dropping events", port)
+    return enabled
+
+
+def invalidate_webui_cache():
+    """Forget probed WebUI reachability/transport and re-read WEBUI_PORT/DEBUG_ID."""
+    global _session
+    _webui_enabled.clear()
+    if _session is not None:
+        _session.close()
+        _session = None
+    for cached in (_get_base_url, _get_url, _get_webui_port, _get_trace_id,
+                   _base_headers, _webui_disabled_by_env):
+        cached.cache_clear()
+
+
+def _deliver(items: List[_QueuedEvent]):
+    """POST drained events in order, coalescing runs of event pushes into batches."""
+    run = []
+    for item in items:
+        if not _ensure_enabled(item.port):
+            continue
+        if _batch_supported and item.path == EVENT_PATH:
+            if run and (item.port, item.headers) != (run[0].port, run[0].headers):
+                _post_batch(run)
+                run = []
+            run.append(item)
+        else:
+            if run:
+                _post_batch(run)
+                run = []
+            _post_event(item)
+    if run:
+        _post_batch(run)
+
+
+def _post_batch(items: List[_QueuedEvent]):
+    """POST event pushes as NDJSON, split at EVENT_BATCH_MAX_BYTES."""
+    chunk, lines, size = [], [], 0
+    for item in items:
+        line = item.body
+        if chunk and size + len(line) + 1 > EVENT_BATCH_MAX_BYTES:
+            _post_ndjson(chunk, lines)
+            chunk, lines, size = [], [], 0
+        chunk.append(item)
+        lines.append(line)
+        size += len(line) + 1
+    _post_ndjson(chunk, lines)
+
+
+def _post_ndjson(chunk: List[_QueuedEvent], lines: List[bytes]):
+    """POST one NDJSON batch (single events and pre-batching servers use EVENT_PATH)."""
+    global _batch_supported, _batch_gzip_supported
+    if len(chunk) == 1 or not _batch_supported:
+        for item in chunk:
+            _post_event(item)
+        return
+
+    first = chunk[0]
+    url = _get_url(first.port, EVENT_BATCH_PATH)
+    headers = {**first.headers, 'Content-Type': 'application/x-ndjson'}
+    body = b'\n'.join(lines)
+    try:
+        if _batch_gzip_supported and len(body) > EVENT_BATCH_GZIP_MIN_BYTES:
+            response = _get_session().post(
+                url,
+                data=gzip.compress(body, compresslevel=1),
+                headers={**headers, 'Content-Encoding': 'gzip'},
+                timeout=2
+            )
+            if response.status_code in (400, 415):
+                # Maybe the server can't decode gzip - resend uncompressed, and
+                # only stop compressing if that is what fixed it
+                response = _get_session().post(url, data=body, headers=headers, timeout=2)
+                if response.ok:
+                    _batch_gzip_supported = False
+        else:
+            response = _get_session().post(url, data=body, headers=headers, timeout=2)
+
+        if response.status_code in EVENT_BATCH_UNSUPPORTED_STATUSES:
+            # Server predates batching - remember and fall back to single pushes
+            _batch_supported = False
+            for item in chunk:
+                _post_event(item)
+            return
+
+        # Status is only checked for debug logging - failures are silent anyway
+        if _logger is not None:
+            if not response.ok:
+                _logger.warning("Failed to push batch of %d events: HTTP %d",
+                                len(chunk), response.status_code)
+            elif _logger.isEnabledFor(logging.INFO):
+                for item in chunk:
+                    if item.event_type is not None:
+                        _logger.info("Event pushed: %s", item.event_type)
+
+    except Exception as e:
+        # Log only if debug mode
+        if _logger is not None:
+            _logger.warning("Failed to push batch of %d events: %s", len(chunk), e)
+
+
+def _post_event(item: _QueuedEvent):
+    """POST one queued event."""
+    event_type = item.event_type
+    try:
+        response = _get_session().post(
+            _get_url(item.port, item.path),
+            data=item.body,
+            headers=item.headers,
+            timeout=2  # Increased from 1 to 2 seconds for reliability
+        )
+        if event_type is not None and _logger is not None:
+            if not response.ok:
+                _logger.warning("Failed to push event '%s': HTTP %d", event_type, response.status_code)
+            else:
+                _logger.info("Event pushed: %s", event_type)
+
+    except Exception as e:
+        # Log only if debug mode
+        if event_type is not None and _logger is not None:
+            _logger.warning("Failed to push event '%s': %s", event_type, e)
+        # Silently fail - WebUI events are non-critical
+        pass
+
+
+def _enqueue(path: str, payload: dict, event_type: Optional[str] = None):
+    """Queue an event for background delivery to the WebUI."""
+    try:
+        if _webui_disabled_by_env():
+            return
+        port = _get_webui_port()
+        if _webui_enabled.get(port) is False:
+            return
+        body = json_dumps(payload)  # Unserializable payloads are dropped here
+        _ensure_worker()
+        _event_queue.put_nowait(_QueuedEvent(port, path, body, _base_headers(), event_type))
+    except queue.Full:
+        if event_type is not None and _logger is not None:
+            _logger.warning("Event queue full, dropped event '%s'", event_type)
+    except Exception:
+        # Silently fail - WebUI events are non-critical
+        pass
+
+
+def flush_events(timeout: float = FLUSH_TIMEOUT_S) -> bool:
+    """Wait until all queued events have been sent.
+
+    Args:
+        timeout: Maximum seconds to wait
+
+    Returns:
+        True if the queue drained, False on timeout
+    """
+    deadline = time.monotonic() + timeout
+    with _event_queue.all_tasks_done:
+        while _event_queue.unfinished_tasks:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            _event_queue.all_tasks_done.wait(remaining)
+    return True
+
+
 def push_toast(message: str, level: str = 'info', duration: int = 3000):
     """Push a toast notification to the WebUI.
 
@@ -81,25 +481,11 @@ def push_toast(message: str, level: str = 'info', duration: int = 3000):
         level: 'info', 'success', 'warning', or 'error'
         duration: Display duration in milliseconds
     """
-    try:
-        port = _get_webui_port()
-        headers = {'Content-Type': 'application/json'}
-        trace_id = _get_trace_id()
-        if trace_id:
-            headers['X-Trace-ID'] = trace_id
-        requests.post(
-            f'http://localhost:{port}/api/toast/push',
-            json={
-                'message': message,
-                'type': level,
-                'duration': duration
-            },
-            headers=headers,
-            timeout=2  # Increased from 1 to 2 seconds for reliability
-        )
-    except:
-        # Silently fail - WebUI events are non-critical
-        pass
+    _enqueue('/api/toast/push', {
+        'message': message,
+        'type': level,
+        'duration': duration
+    })
 
 
 def push_image_event(event_type: str, data: dict):
@@ -109,26 +495,12 @@ def push_image_event(event_type: str, data: dict):
         event_type: 'image_started', 'image_complete', or 'image_failed'
         data: Event data dict with prompt, path, url, etc.
     """
-    try:
-        # For now, image events go through the same mechanism
-        # In the future, could have a dedicated endpoint
-        port = _get_webui_port()
-        headers = {'Content-Type': 'application/json'}
-        trace_id = _get_trace_id()
-        if trace_id:
-            headers['X-Trace-ID'] = trace_id
-        requests.post(
-            f'http://localhost:{port}/api/event/push',
-            json={
-                'type': event_type,
-                'data': data
-            },
-            headers=headers,
-            timeout=2  # Increased from 1 to 2 seconds for reliability
-        )
-    except:
-        # Silently fail - WebUI events are non-critical
-        pass
+    # For now, image events go through the same mechanism
+    # In the future, could have a dedicated endpoint
+    _enqueue(EVENT_PATH, {
+        'type': event_type,
+        'data': data
+    })
 
 
 def push_event(event_type: str, data: dict):
@@ -138,29 +510,7 @@ def push_event(event_type: str, data: dict):
         event_type: Event type identifier
         data: Event data dict
     """
-    try:
-        port = _get_webui_port()
-        headers = {'Content-Type': 'application/json'}
-        trace_id = _get_trace_id()
-        if trace_id:
-            headers['X-Trace-ID'] = trace_id
-        response = requests.post(
-            f'http://localhost:{port}/api/event/push',
-            json={
-                'type': event_type,
-                'data': data
-            },
-            headers=headers,
-            timeout=2  # Increased from 1 to 2 seconds for reliability
-        )
-        response.raise_for_status()
-
-        if _logger:
-            _logger.info(f"Event pushed: {event_type}")
-
-    except Exception as e:
-        # Log only if debug mode
-        if _logger:
-            _logger.warning(f"Failed to push event '{event_type}': {e}")
-        # Still silently fail - non-critical
-        pass
+    _enqueue(EVENT_PATH, {
+        'type': event_type,
+        'data': data
+    }, event_type=event_type)
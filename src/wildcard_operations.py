@@ -38,14 +38,20 @@ USAGE:
     checkpoints = get_affected_checkpoints(op, all_checkpoints, base_wildcards)
 """
 
-import json
-import yaml
+import copy
+import functools
+import re
 from pathlib import Path
-from typing import Dict, List, Set, Any, Optional, Tuple
+from typing import Callable, Dict, List, Set, Any, Optional, Tuple
 from dataclasses import dataclass, field
 
+from src.fast_json import loads as json_loads
 
-@dataclass
+# PyYAML is imported where operation files are read/written - the manifest
+# and checkpoint loaders only need JSON
+
+
+@dataclass(slots=True)
 class WildcardOperation:
     """Represents a single wildcard operation set.
 
@@ -55,12 +61,15 @@ class WildcardOperation:
     Note: To remove text, use replace with an empty "to" value.
     """
     name: str
-    wildcards: Dict[str, Dict[str, Any]] = field(default_factory=dict)
-    # wildcards format: {
-    #     "mood": {
-    #         "replace": [{"from": "sunny day", "to": "sunset"}]
-    #     }
+    wildcards: Dict[str, Tuple[Tuple[str, str], ...]] = field(default_factory=dict)
+    # wildcards format - (from, to) replacement pairs in order: {
+    #     "mood": (("sunny day", "sunset"),)
     # }
+    # Cached is_empty() result - wildcards is not modified after construction
+    _is_empty: bool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._is_empty = not any(self.wildcards.values())
 
     @classmethod
     def from_yaml(cls, name: str, yaml_data: dict) -> 'WildcardOperation':
@@ -82,19 +91,19 @@ class WildcardOperation:
             if not wc_name:
                 continue
 
-            wildcards[wc_name] = {
-                "replace": []
-            }
-
-            # Parse replacements
+            # Parse replacements ("from"/"to" are accepted as aliases; an
+            # empty "with" is kept - it means remove the text - but a rule
+            # without source text matches nothing and is dropped)
+            replacements = []
             for rep in wc_op.get("replace", []):
                 from_text = rep.get("text") or rep.get("from")
-                to_text = rep.get("with") or rep.get("to")
-                if from_text is not None and to_text is not None:
-                    wildcards[wc_name]["replace"].append({
-                        "from": from_text,
-                        "to": to_text
-                    })
+                to_text = rep.get("with")
+                if to_text is None:
+                    to_text = rep.get("to")
+                if from_text and to_text is not None:
+                    replacements.append((from_text, to_text))
+
+            wildcards[wc_name] = tuple(replacements)
 
         return cls(name=name, wildcards=wildcards)
 
@@ -102,13 +111,13 @@ class WildcardOperation:
         """Convert operation to YAML-serializable dict."""
         wildcards_list = []
 
-        for wc_name, ops in self.wildcards.items():
+        for wc_name, replacements in self.wildcards.items():
             wc_entry = {"name": wc_name}
 
-            if ops.get("replace"):
+            if replacements:
                 wc_entry["replace"] = [
-                    {"text": r["from"], "with": r["to"]}
-                    for r in ops["replace"]
+                    {"text": from_text, "with": to_text}
+                    for from_text, to_text in replacements
                 ]
 
             wildcards_list.append(wc_entry)
@@ -117,10 +126,63 @@ class WildcardOperation:
 
     def is_empty(self) -> bool:
         """Check if operation has no actual operations defined."""
-        for ops in self.wildcards.values():
-            if ops.get("replace"):
-                return False
-        return True
+        return self._is_empty
+
+
+# =============================================================================
+# FILE CACHE
+# =============================================================================
+
+# Parsed file contents by path, reused while (mtime_ns, size) is unchanged so
+# repeated loads in one process (summary, apply, affected checkpoints) parse
+# each file once. Loaders that return file data hand out deep copies, so
+# callers may modify it without touching the cache.
+_file_cache: Dict[str, Tuple[int, int, Any]] = {}
+
+
+def _load_cached(path: Path, parse: Callable[[Path], Any]) -> Any:
+    """Return parse(path), reusing the previous result if the file is unchanged.
+
+    Raises whatever stat()/parse raise; failures are not cached.
+    """
+    st = path.stat()
+    key = str(path)
+    entry = _file_cache.get(key)
+    if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+        return entry[2]
+    value = parse(path)
+    _file_cache[key] = (st.st_mtime_ns, st.st_size, value)
+    return value
+
+
+def clear_cache():
+    """Drop all cached operation/manifest/checkpoint file contents."""
+    _file_cache.clear()
+
+
+def _parse_yaml(path: Path) -> Any:
+    import yaml
+    try:
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:
+        from yaml import SafeLoader
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+
+def _parse_json(path: Path) -> Any:
+    with open(path, 'rb') as f:
+        return json_loads(f.read())
+
+
+# Job dirs arrive as str or Path; batch pipelines pass the same few over and
+# over, so the Path objects are built once per distinct value
+_as_path = functools.lru_cache(maxsize=64)(Path)
+
+
+@functools.lru_cache(maxsize=64)
+def _operations_dir(job_dir) -> Path:
+    return _as_path(job_dir) / "operations"
 
 
 def load_operation(job_dir: Path, operation_name: str) -> Optional[WildcardOperation]:
@@ -133,15 +195,13 @@ def load_operation(job_dir: Path, operation_name: str) -> Optional[WildcardOpera
     Returns:
         WildcardOperation instance, or None if not found
     """
-    operations_dir = Path(job_dir) / "operations"
-    operation_path = operations_dir / f"{operation_name}.yaml"
+    operation_path = _operations_dir(job_dir) / f"{operation_name}.yaml"
 
     if not operation_path.exists():
         return None
 
     try:
-        with open(operation_path, 'r') as f:
-            yaml_data = yaml.safe_load(f) or {}
+        yaml_data = _load_cached(operation_path, _parse_yaml) or {}
         return WildcardOperation.from_yaml(operation_name, yaml_data)
     except Exception:
         return None
@@ -157,15 +217,23 @@ def save_operation(job_dir: Path, operation: WildcardOperation) -> Path:
     Returns:
         Path to written file
     """
-    operations_dir = Path(job_dir) / "operations"
+    import yaml
+    try:
+        from yaml import CSafeDumper as SafeDumper
+    except ImportError:
+        from yaml import SafeDumper
+
+    operations_dir = _operations_dir(job_dir)
     operations_dir.mkdir(exist_ok=True)
 
     operation_path = operations_dir / f"{operation.name}.yaml"
 
     yaml_data = operation.to_yaml()
+    data = yaml.dump(yaml_data, Dumper=SafeDumper, default_flow_style=False,
+                     allow_unicode=True, sort_keys=False, encoding='utf-8')
 
-    with open(operation_path, 'w') as f:
-        yaml.dump(yaml_data, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+    with open(operation_path, 'wb') as f:
+        f.write(data)
 
     return operation_path
 
@@ -182,7 +250,7 @@ def list_operations(job_dir: Path) -> List[str]:
     operations = []
 
     # Check operations/ directory
-    operations_dir = Path(job_dir) / "operations"
+    operations_dir = _operations_dir(job_dir)
     if operations_dir.exists():
         for f in operations_dir.glob("*.yaml"):
             operations.append(f.stem)
@@ -190,6 +258,14 @@ def list_operations(job_dir: Path) -> List[str]:
     return sorted(operations)
 
 
+def _value_to_index(values: List[str]) -> Dict[str, int]:
+    """Map each wildcard value to its first index (same as values.index())."""
+    value_to_idx = {}
+    for i, value in enumerate(values):
+        value_to_idx.setdefault(value, i)
+    return value_to_idx
+
+
 def compute_affected_indices(
     operation: WildcardOperation,
     base_wildcards: Dict[str, List[str]]
@@ -206,26 +282,66 @@ def compute_affected_indices(
         Dict mapping wildcard_name -> set of affected indices
         Example: {"mood": {0, 2}, "pose": {1}}
     """
+    if operation._is_empty:
+        return {}
+    affected, _ = _affected(operation, base_wildcards)
+    return {wc_name: set(indices) for wc_name, indices in affected.items()}
+
+
+def _affected(
+    operation: WildcardOperation,
+    base_wildcards: Dict[str, List[str]]
+) -> Tuple[Dict[str, frozenset], frozenset]:
+    """Affected indices and their flattened (name, index) pairs, memoized.
+
+    Summary, affected-checkpoint and sparse-data helpers all need the same
+    result for one operation, so it is cached by content: the operation's
+    replacement pairs plus the base values of the wildcards it touches.
+    The returned containers are shared - do not mutate them.
+    """
+    try:
+        op_items = tuple(operation.wildcards.items())
+        base_items = tuple(
+            (wc_name, tuple(base_wildcards[wc_name]))
+            for wc_name in operation.wildcards
+            if wc_name in base_wildcards
+        )
+        return _affected_cached(op_items, base_items)
+    except TypeError:
+        # Unhashable values (hand-built operation or odd manifest) - no cache
+        return _compute_affected(operation.wildcards, base_wildcards)
+
+
+@functools.lru_cache(maxsize=32)
+def _affected_cached(op_items: tuple, base_items: tuple) -> Tuple[Dict[str, frozenset], frozenset]:
+    return _compute_affected(dict(op_items), dict(base_items))
+
+
+def _compute_affected(
+    wildcards: Dict[str, Tuple[Tuple[str, str], ...]],
+    base_wildcards: Dict[str, List[str]]
+) -> Tuple[Dict[str, frozenset], frozenset]:
+    """Uncached worker for _affected()."""
     affected = {}
 
-    for wc_name, ops in operation.wildcards.items():
+    for wc_name, replacements in wildcards.items():
         if wc_name not in base_wildcards:
             continue
 
-        wc_values = base_wildcards[wc_name]
+        value_to_idx = _value_to_index(base_wildcards[wc_name])
         indices = set()
 
         # Handle replacements (including empty replacements for removal)
-        for rep in ops.get("replace", []):
-            from_text = rep.get("from")
-            if from_text and from_text in wc_values:
-                idx = wc_values.index(from_text)
-                indices.add(idx)
+        for from_text, _ in replacements:
+            if from_text:
+                idx = value_to_idx.get(from_text)
+                if idx is not None:
+                    indices.add(idx)
 
         if indices:
-            affected[wc_name] = indices
+            affected[wc_name] = frozenset(indices)
 
-    return affected
+    return affected, _flatten_affected(affected)
 
 
 def image_is_affected(
@@ -254,6 +370,20 @@ def image_is_affected(
     return False
 
 
+def _flatten_affected(affected_indices: Dict[str, Set[int]]) -> frozenset:
+    """Flatten affected indices into a set of (wildcard_name, index) pairs."""
+    return frozenset(
+        (wc_name, idx)
+        for wc_name, indices in affected_indices.items()
+        for idx in indices
+    )
+
+
+def _image_is_affected_flat(image_wc: Dict[str, int], flat: frozenset) -> bool:
+    """image_is_affected() against _flatten_affected() output (one hash per pair)."""
+    return not flat.isdisjoint(image_wc.items())
+
+
 def count_affected_images(
     checkpoints: List[dict],
     affected_indices: Dict[str, Set[int]]
@@ -267,14 +397,18 @@ def count_affected_images(
     Returns:
         Tuple of (affected_images, affected_checkpoints)
     """
+    if not affected_indices:
+        return 0, 0
+
     affected_images = 0
     affected_checkpoints = 0
+    flat = _flatten_affected(affected_indices)
 
     for cp in checkpoints:
         cp_affected = False
         for combo in cp.get('combinations', []):
             wc = combo.get('wildcards')
-            if wc and image_is_affected(wc, affected_indices):
+            if wc and _image_is_affected_flat(wc, flat):
                 affected_images += 1
                 cp_affected = True
         if cp_affected:
@@ -283,6 +417,9 @@ def count_affected_images(
     return affected_images, affected_checkpoints
 
 
+_SPACE_RUN_RE = re.compile(" {2,}")
+
+
 def apply_to_prompt(
     prompt: str,
     operation: WildcardOperation,
@@ -303,41 +440,40 @@ def apply_to_prompt(
     Returns:
         Transformed prompt text
     """
+    if operation._is_empty:
+        return _clean_prompt(prompt)
+
     result = prompt
 
-    for wc_name, ops in operation.wildcards.items():
+    for wc_name, replacements in operation.wildcards.items():
         if wc_name not in base_wildcards:
             continue
 
-        wc_values = base_wildcards[wc_name]
+        # Only needed to check replacements against the selected value
+        selected_idx = selected_values.get(wc_name) if selected_values is not None else None
+        value_to_idx = _value_to_index(base_wildcards[wc_name]) if selected_idx is not None else None
 
         # Handle replacements (including empty replacements for removal)
-        for rep in ops.get("replace", []):
-            from_text = rep.get("from")
-            to_text = rep.get("to")
-
-            if not from_text or to_text is None:
+        for from_text, to_text in replacements:
+            if not from_text:
                 continue
 
             # If selected_values is provided, only apply if this value is selected
-            if selected_values is not None:
-                selected_idx = selected_values.get(wc_name)
-                if selected_idx is not None:
-                    if from_text in wc_values:
-                        from_idx = wc_values.index(from_text)
-                        if selected_idx != from_idx:
-                            continue  # Skip - not the selected value
+            if value_to_idx is not None:
+                from_idx = value_to_idx.get(from_text)
+                if from_idx is not None and selected_idx != from_idx:
+                    continue  # Skip - not the selected value
 
             # Apply the replacement
             result = result.replace(from_text, to_text)
 
-    # Clean up double spaces/commas from empty replacements
-    while "  " in result:
-        result = result.replace("  ", " ")
-    result = result.replace(" ,", ",").replace(", ,", ",")
-    result = result.strip()
+    return _clean_prompt(result)
+
 
-    return result
+def _clean_prompt(text: str) -> str:
+    """Clean up double spaces/commas left by empty replacements."""
+    # Once space runs are collapsed, a single " ," pass leaves no ", ," behind
+    return _SPACE_RUN_RE.sub(" ", text).replace(" ,", ",").strip()
 
 
 def get_affected_checkpoints(
@@ -357,15 +493,20 @@ def get_affected_checkpoints(
     Returns:
         List of path_string values for affected checkpoints
     """
-    affected_indices = compute_affected_indices(operation, base_wildcards)
+    if operation._is_empty:
+        return []
+
+    _, flat = _affected(operation, base_wildcards)
     affected_paths = []
+    seen = set()
 
     for cp in checkpoints:
         for combo in cp.get('combinations', []):
             wc = combo.get('wildcards')
-            if wc and image_is_affected(wc, affected_indices):
+            if wc and _image_is_affected_flat(wc, flat):
                 path = cp.get('path_string')
-                if path and path not in affected_paths:
+                if path and path not in seen:
+                    seen.add(path)
                     affected_paths.append(path)
                 break  # Only need one affected image per checkpoint
 
@@ -389,12 +530,12 @@ def get_affected_images_for_checkpoint(
     Returns:
         List of affected combination dicts
     """
-    affected_indices = compute_affected_indices(operation, base_wildcards)
+    _, flat = _affected(operation, base_wildcards)
     affected = []
 
     for combo in checkpoint.get('combinations', []):
         wc = combo.get('wildcards')
-        if wc and image_is_affected(wc, affected_indices):
+        if wc and _image_is_affected_flat(wc, flat):
             affected.append(combo)
 
     return affected
@@ -415,35 +556,20 @@ def generate_operation_summary(
     Returns:
         Summary dict with affected counts and operations
     """
-    # Calculate total base images
-    total_images = sum(
-        len(cp.get('combinations', [])) for cp in checkpoints
-    )
-
-    # Get affected indices and counts
-    affected_indices = compute_affected_indices(operation, base_wildcards)
-    affected_images, affected_checkpoints_count = count_affected_images(
-        checkpoints, affected_indices
-    )
-
-    # Parse affected wildcards summary
+    # One pass over the operation: summary, detailed list and affected indices
     affected_wildcards = {}
-    for wc_name, ops in operation.wildcards.items():
-        replaced = len(ops.get("replace", []))
-        if replaced > 0:
-            affected_wildcards[wc_name] = {
-                "replaced": replaced
-            }
-
-    # Build operations list (detailed)
     operations = []
-    for wc_name, ops in operation.wildcards.items():
-        wc_values = base_wildcards.get(wc_name, [])
+    affected_indices = {}
+    for wc_name, replacements in operation.wildcards.items():
+        if not replacements:
+            continue
+        affected_wildcards[wc_name] = {
+            "replaced": len(replacements)
+        }
 
-        for rep in ops.get("replace", []):
-            from_text = rep.get("from")
-            to_text = rep.get("to")
-            idx = wc_values.index(from_text) if from_text in wc_values else -1
+        value_to_idx = _value_to_index(base_wildcards.get(wc_name, []))
+        for from_text, to_text in replacements:
+            idx = value_to_idx.get(from_text, -1)
             operations.append({
                 "type": "replace",
                 "wildcard": wc_name,
@@ -451,10 +577,29 @@ def generate_operation_summary(
                 "from": from_text,
                 "to": to_text
             })
+            if from_text and idx != -1:
+                affected_indices.setdefault(wc_name, set()).add(idx)
+
+    # One pass over checkpoints: total and affected counts
+    flat = _flatten_affected(affected_indices)
+    total_images = 0
+    affected_images = 0
+    affected_checkpoints_count = 0
+    for cp in checkpoints:
+        combinations = cp.get('combinations', [])
+        total_images += len(combinations)
+        cp_affected = False
+        for combo in combinations:
+            wc = combo.get('wildcards')
+            if wc and _image_is_affected_flat(wc, flat):
+                affected_images += 1
+                cp_affected = True
+        if cp_affected:
+            affected_checkpoints_count += 1
 
     return {
         "operation_name": operation.name,
-        "type": "sparse" if not operation.is_empty() else "base",
+        "type": "sparse" if affected_wildcards else "base",
         "affected_wildcards": affected_wildcards,
         "total_base_images": total_images,
         "affected_images": affected_images,
@@ -520,7 +665,7 @@ def validate_operation(
     """
     warnings = []
 
-    for wc_name, ops in operation.wildcards.items():
+    for wc_name, replacements in operation.wildcards.items():
         if wc_name not in base_wildcards:
             warnings.append(f"Unknown wildcard: '{wc_name}'")
             continue
@@ -528,8 +673,7 @@ def validate_operation(
         wc_values = base_wildcards[wc_name]
 
         # Check replacements
-        for rep in ops.get("replace", []):
-            from_text = rep.get("from")
+        for from_text, _ in replacements:
             if from_text and from_text not in wc_values:
                 warnings.append(f"Replace source '{from_text}' not found in wildcard '{wc_name}'")
 
@@ -549,19 +693,75 @@ def load_base_wildcards(job_dir: Path) -> Dict[str, List[str]]:
     Returns:
         Dict of wildcard_name -> list of values
     """
-    manifest_path = Path(job_dir) / "outputs" / "manifest.json"
+    manifest_path = _as_path(job_dir) / "outputs" / "manifest.json"
 
     if not manifest_path.exists():
         return {}
 
     try:
-        with open(manifest_path, 'r') as f:
-            manifest = json.load(f)
-        return manifest.get("wildcards", {})
+        wildcards = _load_cached(manifest_path, _parse_json).get("wildcards", {})
+        return copy.deepcopy(wildcards)
     except Exception:
         return {}
 
 
+def _parse_data_checkpoint(data_path: Path) -> Optional[dict]:
+    """Build a checkpoint dict from a data.json file (None if it has no images)."""
+    data = _parse_json(data_path)
+
+    # Build checkpoint structure from data.json
+    path_string = data.get("path_string", data_path.parent.name)
+    images = data.get("images", [])
+
+    combinations = []
+    for img in images:
+        combinations.append({
+            "index": img.get("i", 1),
+            "wildcards": img.get("wc", {})
+        })
+
+    if not combinations:
+        return None
+    return {
+        "path_string": path_string,
+        "combinations": combinations
+    }
+
+
+def _find_data_files(prompt_dir: Path) -> List[Path]:
+    """Find data.json files in subdirectories of prompt_dir (not its root).
+
+    Same files and order as prompt_dir.rglob("data.json") minus the root
+    one, but each directory costs a single scandir - entry types come from
+    the directory listing and data.json is spotted by name instead of a
+    stat per directory.
+    """
+    import os
+
+    found = []
+
+    def walk(dir_path: str, is_root: bool):
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            return
+        subdirs = []
+        for entry in entries:
+            if entry.name == "data.json" and not is_root:
+                found.append(Path(entry.path))
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+            except OSError:
+                pass
+        for subdir in subdirs:
+            walk(subdir, False)
+
+    walk(str(prompt_dir), True)
+    return found
+
+
 def load_checkpoints(job_dir: Path, composition: int, prompt_id: str = None) -> List[dict]:
     """Load checkpoint data from prompt.json files.
 
@@ -573,7 +773,7 @@ def load_checkpoints(job_dir: Path, composition: int, prompt_id: str = None) ->
     Returns:
         List of checkpoint dicts with combinations
     """
-    comp_dir = Path(job_dir) / "outputs" / f"c{composition}"
+    comp_dir = _as_path(job_dir) / "outputs" / f"c{composition}"
 
     if not comp_dir.exists():
         return []
@@ -593,36 +793,17 @@ def load_checkpoints(job_dir: Path, composition: int, prompt_id: str = None) ->
         prompt_json = prompt_dir / "prompt.json"
         if prompt_json.exists():
             try:
-                with open(prompt_json, 'r') as f:
-                    prompt_data = json.load(f)
-                checkpoints.extend(prompt_data.get("checkpoints", []))
+                prompt_data = _load_cached(prompt_json, _parse_json)
+                checkpoints.extend(copy.deepcopy(prompt_data.get("checkpoints", [])))
             except Exception:
                 pass
 
         # Also load from data.json files in subdirectories
-        for data_path in prompt_dir.rglob("data.json"):
-            if data_path.parent == prompt_dir:
-                continue  # Skip root level
+        for data_path in _find_data_files(prompt_dir):
             try:
-                with open(data_path, 'r') as f:
-                    data = json.load(f)
-
-                # Build checkpoint structure from data.json
-                path_string = data.get("path_string", data_path.parent.name)
-                images = data.get("images", [])
-
-                combinations = []
-                for img in images:
-                    combinations.append({
-                        "index": img.get("i", 1),
-                        "wildcards": img.get("wc", {})
-                    })
-
-                if combinations:
-                    checkpoints.append({
-                        "path_string": path_string,
-                        "combinations": combinations
-                    })
+                checkpoint = _load_cached(data_path, _parse_data_checkpoint)
+                if checkpoint is not None:
+                    checkpoints.append(copy.deepcopy(checkpoint))
             except Exception:
                 pass
 
@@ -24,7 +24,7 @@ Text Variants:
 
 FUNCTIONS:
 ----------
-resolve_wildcards(text_list, wildcard_map, track_usage=False):
+resolve_wildcards(text_list, wildcard_map, track_usage=False, wildcard_lookup=None):
     Perform random wildcard substitution in a list of text templates.
     Optionally tracks which values were chosen for each text.
     Returns resolved texts (and usage data if track_usage=True).
@@ -34,6 +34,9 @@ process_text_variant(variant, wildcard_lookup, default_mode=0):
     of strings based on wildcard consumption rules.
     Used during prompt expansion to handle mixed text/dict entries.
 
+iter_text_variant(variant, wildcard_lookup, default_mode=0):
+    Same as process_text_variant, but yields the expanded strings lazily.
+
 apply_text_consumption_mode(text_items, text_mode):
     Apply text consumption mode to extended text items.
     Similar to wildcard consumption but for text lists from extensions.
@@ -79,14 +82,18 @@ AI ASSISTANT NOTES:
 - process_text_variant handles both string and dict text entries
 """
 
+import functools
 import re
 import random
 from itertools import product
 
 from src.exceptions import WildcardError
 
+# Regex to find __WILDNAME__ placeholders (includes hyphens)
+_WILDCARD_RE = re.compile(r"__([a-zA-Z0-9_-]+)__")
+
 
-def resolve_wildcards(text_list, wildcard_map, track_usage=False):
+def resolve_wildcards(text_list, wildcard_map, track_usage=False, wildcard_lookup=None):
     """
     Perform random wildcard substitution in a list of text templates.
     
@@ -97,6 +104,8 @@ def resolve_wildcards(text_list, wildcard_map, track_usage=False):
         text_list: List of text templates containing __wildcard__ placeholders
         wildcard_map: List of wildcard definition dicts with 'name' and 'text' keys
         track_usage: If True, track which values were chosen for each text
+        wildcard_lookup: Optional prebuilt {name: text list} dict for wildcard_map,
+            for callers that already have one (avoids rebuilding it per call)
         
     Returns:
         If track_usage=False: List of resolved text strings
@@ -117,20 +126,19 @@ def resolve_wildcards(text_list, wildcard_map, track_usage=False):
         # -> (["A standing woman"], [{"pose": "standing"}])
     """
     # Build lookup dict from wildcard definitions
-    wildcard_lookup = {wc.get('name'): wc.get('text', []) for wc in wildcard_map if wc.get('name')}
+    if wildcard_lookup is None:
+        wildcard_lookup = {wc.get('name'): wc.get('text', []) for wc in wildcard_map if wc.get('name')}
     
     resolved_texts = []
     usage_tracking = []
-    
-    # Regex to find __WILDNAME__ placeholders (includes hyphens)
-    wildcard_pattern = re.compile(r"__([a-zA-Z0-9_-]+)__")
+    randrange = random.randrange
 
     for text_template in text_list:
-        resolved_text = text_template
         wildcards_used = {}
         
-        # Find all wildcards in the current template
-        placeholders = wildcard_pattern.findall(text_template)
+        # Find all wildcards in the current template (most texts have none,
+        # and a substring check is much cheaper than the regex scan)
+        placeholders = _WILDCARD_RE.findall(text_template) if '__' in text_template else ()
         
         if not placeholders:
             resolved_texts.append(text_template)
@@ -138,9 +146,10 @@ def resolve_wildcards(text_list, wildcard_map, track_usage=False):
                 usage_tracking.append(wildcards_used)
             continue
             
-        # Perform substitution for all unique placeholders found
+        # Pick a value for each unique placeholder found
         # Sort them to ensure deterministic order of random number consumption
-        for name in sorted(list(set(placeholders))):
+        chosen = {}
+        for name in sorted(set(placeholders)):
             if name not in wildcard_lookup:
                 raise WildcardError(f"Wildcard '___{name}___' referenced in prompt but not defined in the 'wildcards' section.")
             
@@ -149,8 +158,9 @@ def resolve_wildcards(text_list, wildcard_map, track_usage=False):
                 raise WildcardError(f"Wildcard '___{name}___' found but has an empty text list.")
             
             # Pick random choice and track its index (1-based for filename)
-            choice_idx = random.randint(0, len(choices) - 1)
+            choice_idx = randrange(len(choices))
             random_choice = choices[choice_idx]
+            chosen[name] = random_choice
             
             # Track which value and index was chosen
             if track_usage:
@@ -158,10 +168,9 @@ def resolve_wildcards(text_list, wildcard_map, track_usage=False):
                     'value': random_choice,
                     'index': choice_idx + 1
                 }
-            
-            # Substitute ALL instances of the placeholder in the template
-            placeholder_token = f"__{name}__"
-            resolved_text = resolved_text.replace(placeholder_token, random_choice)
+
+        # Substitute ALL instances of every placeholder in one pass
+        resolved_text = _WILDCARD_RE.sub(lambda m: chosen[m.group(1)], text_template)
 
         resolved_texts.append(resolved_text)
         if track_usage:
@@ -210,12 +219,23 @@ def process_text_variant(variant, wildcard_lookup, default_mode=0):
         }, lookup)
         # Returns: ["A __pose__ woman"]  (placeholder kept for runtime)
     """
+    return list(iter_text_variant(variant, wildcard_lookup, default_mode))
+
+
+def iter_text_variant(variant, wildcard_lookup, default_mode=0):
+    """
+    Like process_text_variant(), but returns an iterator over the expanded strings.
+    
+    Validation, warnings and random sampling happen immediately; only the
+    Cartesian product strings are built lazily, so large expansions can be
+    consumed without holding an intermediate list.
+    """
     if isinstance(variant, str):
-        return [variant]
+        return iter([variant])
     
     if not isinstance(variant, dict) or 'content' not in variant:
         print(f"   ⚠️  Warning: Invalid text structure found, skipping. Expected string or dict with 'content'.")
-        return []
+        return iter([])
 
     template = variant['content']
     config = variant.get('wildcards')
@@ -229,15 +249,15 @@ def process_text_variant(variant, wildcard_lookup, default_mode=0):
         print(f"   ⚠️  Warning: Invalid wildcards config type (expected int), using default mode")
         count = default_mode
     
-    # Regex to find wildcards
-    wildcard_pattern = re.compile(r"__([a-zA-Z0-9_-]+)__")
-    placeholders = wildcard_pattern.findall(template)
+    if '__' not in template:
+        return iter([template])
+    
+    parts, unique_placeholders, name_positions = _split_template(template)
     
-    if not placeholders:
-        return [template]
+    if not unique_placeholders:
+        return iter([template])
 
     # Organize values for Cartesian product based on count
-    unique_placeholders = sorted(list(set(placeholders)))
     
     # Build a map of {placeholder_name: list_of_strings_to_use}
     values_map = {}
@@ -265,16 +285,32 @@ def process_text_variant(variant, wildcard_lookup, default_mode=0):
     # Generate Cartesian product of all placeholder values
     lists_to_product = [values_map[name] for name in unique_placeholders]
     
-    expanded_strings = []
+    return _join_combinations(list(parts), name_positions, lists_to_product)
+
+
+@functools.lru_cache(maxsize=1024)
+def _split_template(template):
+    """
+    Split a template once into its placeholder structure (cached per template).
     
-    for combo in product(*lists_to_product):
-        current_text = template
-        for i, name in enumerate(unique_placeholders):
-            val = combo[i]
-            current_text = current_text.replace(f"__{name}__", val)
-        expanded_strings.append(current_text)
+    Returns (parts, unique_placeholders, name_positions):
+        parts: [literal, name, literal, name, ..., literal] from _WILDCARD_RE.split
+        unique_placeholders: Sorted unique names (product / random draw order)
+        name_positions: For each placeholder slot in parts, its index in unique_placeholders
+    """
+    parts = _WILDCARD_RE.split(template)
+    placeholders = parts[1::2]
+    unique_placeholders = tuple(sorted(set(placeholders)))
+    position = {name: i for i, name in enumerate(unique_placeholders)}
+    name_positions = tuple(position[name] for name in placeholders)
+    return tuple(parts), unique_placeholders, name_positions
 
-    return expanded_strings
+
+def _join_combinations(parts, name_positions, lists_to_product):
+    """Yield parts joined with each combination filled into the placeholder slots."""
+    for combo in product(*lists_to_product):
+        parts[1::2] = [combo[i] for i in name_positions]
+        yield "".join(parts)
 
 
 def apply_text_consumption_mode(text_items, text_mode):
@@ -20,6 +20,7 @@ Workflow YAML format:
       requires_image_reload: false
 """
 
+import copy
 import yaml
 import time
 import importlib.util
@@ -28,6 +29,12 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 
+# libyaml-backed emitter/parser when PyYAML was built with it
+try:
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
 
 class Workflow:
     """Represents a workflow configuration."""
@@ -62,6 +69,10 @@ class WorkflowManager:
         self.workflows_dir = self.project_root / 'workflows'
         self.job_workflows_dir = job_dir / 'workflows'
         self.mods_dir = self.project_root / 'mods'
+        # Parsed workflow YAML by path, reused while (mtime_ns, size) is unchanged
+        self._wf_cache: Dict[Path, Tuple[int, int, Dict]] = {}
+        # Loaded mod modules by file, reused while mtime_ns is unchanged
+        self._mod_cache: Dict[Path, Tuple[int, Any]] = {}
     
     def list_workflows(self) -> List[Workflow]:
         """List all available workflows (global + job-level).
@@ -124,7 +135,7 @@ class WorkflowManager:
                 'settings': workflow.settings
             }
             with open(target_path, 'w') as f:
-                yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+                yaml.dump(data, f, Dumper=SafeDumper, default_flow_style=False, sort_keys=False)
             return True, str(target_path)
         except Exception as e:
             return False, str(e)
@@ -299,8 +310,17 @@ class WorkflowManager:
     def _load_workflow_file(self, path: Path, scope: str) -> Optional[Workflow]:
         """Load a workflow from YAML file."""
         try:
-            with open(path, 'r') as f:
-                data = yaml.safe_load(f) or {}
+            st = path.stat()
+            cached = self._wf_cache.get(path)
+            if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                data = cached[2]
+            else:
+                with open(path, 'r') as f:
+                    data = yaml.load(f, Loader=SafeLoader) or {}
+                self._wf_cache[path] = (st.st_mtime_ns, st.st_size, data)
+            # Each Workflow gets its own copy - mod configs are handed to
+            # mods as params and must not write through to the cache
+            data = copy.deepcopy(data)
             
             workflow_id = path.stem
             return Workflow(
@@ -327,12 +347,19 @@ class WorkflowManager:
             return {'success': False, 'error': f"Mod not found: {mod_id}"}
         
         try:
-            spec = importlib.util.spec_from_file_location(mod_id, mod_file)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            
-            if not hasattr(module, 'execute'):
-                return {'success': False, 'error': 'Mod has no execute function'}
+            # Import once per manager (re-import if the file changes)
+            mtime_ns = mod_file.stat().st_mtime_ns
+            cached = self._mod_cache.get(mod_file)
+            if cached and cached[0] == mtime_ns:
+                module = cached[1]
+            else:
+                spec = importlib.util.spec_from_file_location(mod_id, mod_file)
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+                
+                if not hasattr(module, 'execute'):
+                    return {'success': False, 'error': 'Mod has no execute function'}
+                self._mod_cache[mod_file] = (mtime_ns, module)
             
             # Execute mod
             params = mod_config or {}
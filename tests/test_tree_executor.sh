@@ -82,7 +82,7 @@ executor = TreeExecutor(jobs, HookPipeline('/tmp', {}, {}))
 queue = executor.build_queue()
 
 # Depth-first: root comp 0 -> child comp 0 -> root comp 1 -> child comp 1
-order = [(e['block_path'], e['composition_idx']) for e in queue]
+order = [(e.block_path, e.composition_idx) for e in queue]
 assert order == [('0', 0), ('0.0', 0), ('0', 1), ('0.0', 1)], f'Wrong order: {order}'
 print('OK: depth-first order')
 " 2>&1)
@@ -9,35 +9,122 @@ JSONL support:
   Without ?line, the entire JSONL file is served as application/x-ndjson.
 """
 
-import json
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from itertools import islice
 from pathlib import Path
 
+# Validated manifest.json bytes by path, reused while (mtime_ns, size) is
+# unchanged - the UI polls the artifact list far more often than pipelines
+# rewrite it
+_manifest_cache = {}
+
 
 def get_project_root():
     """Get project root directory (4 levels up from this file)."""
     return Path(__file__).parent.parent.parent.parent.parent
 
 
+def _fast_json():
+    """Import src.fast_json (orjson when installed, else stdlib json)."""
+    import sys
+
+    # Ensure project root is in sys.path for src.* imports
+    root_str = str(get_project_root())
+    if root_str not in sys.path:
+        sys.path.insert(0, root_str)
+
+    from src import fast_json
+    return fast_json
+
+
+def _etag(st):
+    """Validator for a file's current version (changes with mtime or size)."""
+    return f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+
+def _not_modified(handler, st, etag):
+    """Whether the request's If-None-Match / If-Modified-Since match st."""
+    if_none_match = handler.headers.get('If-None-Match')
+    if if_none_match is not None:
+        # Takes precedence over If-Modified-Since; weak comparison is fine for GET
+        tags = [t.strip().removeprefix('W/') for t in if_none_match.split(',')]
+        return etag in tags or '*' in tags
+
+    if_modified_since = handler.headers.get('If-Modified-Since')
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return False
+        return int(st.st_mtime) <= since
+
+    return False
+
+
+def _send_cache_headers(handler, st, etag, cache_control):
+    handler.send_header('ETag', etag)
+    handler.send_header('Last-Modified', formatdate(st.st_mtime, usegmt=True))
+    handler.send_header('Cache-Control', cache_control)
+
+
+def _send_not_modified(handler, st, etag, cache_control):
+    handler.send_response(304)
+    _send_cache_headers(handler, st, etag, cache_control)
+    handler.send_header('Access-Control-Allow-Origin', '*')
+    handler.end_headers()
+
+
 def handle_artifacts_list(handler, job_id):
     """Return manifest.json contents for a job's artifacts."""
     project_root = get_project_root()
     manifest_path = project_root / "jobs" / job_id / "_artifacts" / "manifest.json"
 
-    if not manifest_path.exists():
+    try:
+        st = manifest_path.stat()
+    except (FileNotFoundError, NotADirectoryError):
         handler.send_json({'artifacts': {}, 'message': 'No artifacts found'})
         return
 
+    # Clients must revalidate on every poll, but an unchanged manifest is a 304
+    cache_control = 'no-cache'
+    etag = _etag(st)
+    if _not_modified(handler, st, etag):
+        _send_not_modified(handler, st, etag, cache_control)
+        return
+
     try:
-        manifest = json.loads(manifest_path.read_text())
-        handler.send_json(manifest)
+        key = str(manifest_path)
+        cached = _manifest_cache.get(key)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            body = cached[2]
+        else:
+            # Parse only to validate - the file itself is served as the body
+            body = manifest_path.read_bytes()
+            _fast_json().loads(body)
+            _manifest_cache[key] = (st.st_mtime_ns, st.st_size, body)
     except Exception as e:
         handler.send_json({'error': str(e)}, 500)
+        return
+
+    handler.send_response(200)
+    handler.send_header('Content-Type', 'application/json')
+    handler.send_header('Content-Length', len(body))
+    handler.send_header('Access-Control-Allow-Origin', '*')
+    _send_cache_headers(handler, st, etag, cache_control)
+    handler.end_headers()
+    try:
+        handler.wfile.write(body)
+    except (BrokenPipeError, ConnectionResetError):
+        pass
 
 
-def handle_artifact_file(handler, job_id, mod_id, filename):
-    """Serve an artifact file — supports JSONL line extraction via ?line=N."""
-    import urllib.parse
+def handle_artifact_file(handler, job_id, mod_id, filename, params=None):
+    """Serve an artifact file — supports JSONL line extraction via ?line=N.
 
+    params is the already-parsed query string from the dispatcher; it is
+    parsed from handler.path when not given.
+    """
     project_root = get_project_root()
     artifact_path = project_root / "jobs" / job_id / "_artifacts" / mod_id / filename
 
@@ -45,18 +132,25 @@ def handle_artifact_file(handler, job_id, mod_id, filename):
         handler.send_json({'error': 'Artifact not found'}, 404)
         return
 
-    # Parse query params for JSONL line extraction
-    parsed = urllib.parse.urlparse(handler.path)
-    params = dict(urllib.parse.parse_qsl(parsed.query))
+    # Query params for JSONL line extraction
+    if params is None:
+        import urllib.parse
+        parsed = urllib.parse.urlparse(handler.path)
+        params = dict(urllib.parse.parse_qsl(parsed.query))
     line_num = params.get('line')
 
     # JSONL line extraction
     if artifact_path.suffix == '.jsonl' and line_num is not None:
         try:
             line_idx = int(line_num)
-            lines = artifact_path.read_text().strip().split('\n')
-            if 0 <= line_idx < len(lines):
-                data = lines[line_idx].encode('utf-8')
+            # Read only up to the requested line instead of the whole file
+            with open(artifact_path, 'r', encoding='utf-8') as f:
+                line = next(islice(f, line_idx, None), None) if line_idx >= 0 else None
+                if line is None:
+                    f.seek(0)
+                    line_count = sum(1 for _ in f)
+            if line is not None:
+                data = line.rstrip('\n').encode('utf-8')
                 handler.send_response(200)
                 handler.send_header('Content-Type', 'application/json')
                 handler.send_header('Content-Length', len(data))
@@ -64,7 +158,7 @@ def handle_artifact_file(handler, job_id, mod_id, filename):
                 handler.end_headers()
                 handler.wfile.write(data)
             else:
-                handler.send_json({'error': f'Line {line_idx} out of range (0-{len(lines)-1})'}, 404)
+                handler.send_json({'error': f'Line {line_idx} out of range (0-{line_count-1})'}, 404)
         except ValueError:
             handler.send_json({'error': f'Invalid line number: {line_num}'}, 400)
         except Exception as e:
@@ -87,13 +181,26 @@ def handle_artifact_file(handler, job_id, mod_id, filename):
     content_type = content_types.get(suffix, 'application/octet-stream')
 
     try:
-        data = artifact_path.read_bytes()
-        handler.send_response(200)
-        handler.send_header('Content-Type', content_type)
-        handler.send_header('Content-Length', len(data))
-        handler.send_header('Access-Control-Allow-Origin', '*')
-        handler.end_headers()
-        handler.wfile.write(data)
+        with open(artifact_path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            size = st.st_size
+            cache_control = 'private, max-age=0, must-revalidate'
+            etag = _etag(st)
+            if _not_modified(handler, st, etag):
+                _send_not_modified(handler, st, etag, cache_control)
+                return
+
+            handler.send_response(200)
+            handler.send_header('Content-Type', content_type)
+            handler.send_header('Content-Length', size)
+            handler.send_header('Access-Control-Allow-Origin', '*')
+            _send_cache_headers(handler, st, etag, cache_control)
+            handler.end_headers()
+            # Stream instead of buffering the whole file - socket.sendfile()
+            # uses os.sendfile() where available and falls back to send()
+            handler.wfile.flush()
+            if size:
+                handler.connection.sendfile(f, 0, size)
     except (BrokenPipeError, ConnectionResetError):
         pass
     except Exception as e:
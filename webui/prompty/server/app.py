@@ -89,7 +89,7 @@ class PUHandler(http.server.SimpleHTTPRequestHandler):
             job_id = urllib.parse.unquote(artifacts_file_match.group(1))
             mod_id = urllib.parse.unquote(artifacts_file_match.group(2))
             filename = urllib.parse.unquote(artifacts_file_match.group(3))
-            artifacts.handle_artifact_file(self, job_id, mod_id, filename)
+            artifacts.handle_artifact_file(self, job_id, mod_id, filename, params)
         elif op_match:
             job_id = urllib.parse.unquote(op_match.group(1))
             operations.handle_operations_list(self, job_id)